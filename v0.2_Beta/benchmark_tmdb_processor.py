@@ -0,0 +1,428 @@
+"""
+TMDBDataProcessor Performans Ölçümleri
+
+Bu script, TMDB dökümü işleme süresini sentetik movies/credits dosyaları üzerinde ölçer.
+Sentetik döküm, işlenmiş örnek verisetindeki başlık, özet ve türlerden türetilir; cast ve
+crew sütunları gerçek TMDB dökümleri gibi satır başına birkaç KB'lık JSON listeleridir.
+Satırların bir kısmı Python literal biçimindedir (tek tırnak), böylece yedek çözüm yolu da ölçülür.
+
+Kullanım:
+    python benchmark_tmdb_processor.py                  # 5.000 / 50.000 / 500.000 film
+    python benchmark_tmdb_processor.py 5000 20000       # kendi boyutlarınız
+
+Not: 500.000 filmlik döküm diskte birkaç GB yer kaplar ve eski sürümle işlenmesi uzun sürer.
+"""
+
+import ast
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import resource
+
+import numpy as np
+import pandas as pd
+
+from tmdb_data_processor import TMDBDataProcessor
+
+
+SOURCE_DATASET = 'processed_tmdb_movies.csv'
+
+DEFAULT_SIZES = [5000, 50000, 500000]
+
+# Sentetik cast/crew listeleri bu kadar hazır liste arasından seçilir (üretim süresini kısaltır)
+BLOB_POOL_SIZE = 2000
+
+# Python literal biçiminde yazılacak satır oranı
+LITERAL_ROW_RATIO = 0.05
+
+# Null/boş adlı kayıtlar: null değerler eksik anahtar gibi boş string sayılır, boş adlar korunur
+NULL_NAMES_JSON = '[{"id": 1, "name": null}, {"id": 2, "name": "Drama"}]'
+EMPTY_NAMES_JSON = '[{"id": 1, "name": ""}, {"id": 2, "name": "A"}]'
+NULL_CAST_JSON = '[{"name": "Actor A"}, {"name": null}, {"name": "Actor B"}]'
+NULL_CREW_JSON = '[{"job": "Director", "name": null}, {"job": "Director", "name": "Jane Doe"}]'
+
+# _write_name_edge_case_dump dökümünün beklenen (genres, keywords, companies, director, actors) değerleri
+NAME_EDGE_CASE_EXPECTED = [
+    (', Drama', '', '', '', 'Actor A, , Actor B'),
+    (', A', ', heist', '', '', ', A'),
+    ('Comedy', '', '', '', '')
+]
+
+
+def create_synthetic_tmdb_dump(source_csv: str, num_movies: int, output_dir: str, seed: int = 42) -> tuple:
+    """
+    Örnek verisetinden TMDB biçiminde sentetik movies ve credits dosyaları üretir.
+
+    Args:
+        source_csv (str): Kaynak (işlenmiş) verisetinin yolu
+        num_movies (int): Üretilecek film sayısı
+        output_dir (str): Dosyaların yazılacağı klasör
+        seed (int): Rastgelelik tohumu
+
+    Returns:
+        tuple: (movies CSV yolu, credits CSV yolu)
+    """
+    rng = np.random.default_rng(seed)
+    source_df = pd.read_csv(source_csv).fillna('')
+
+    genre_names = sorted({genre for genres in source_df['genres'] for genre in genres.split(', ') if genre})
+    word_pool = np.array(' '.join(source_df['plot_summary'].astype(str)).split())
+    people = [f"{first} {last}" for first in word_pool[:200] for last in word_pool[200:400]]
+
+    def person_list(size, fields):
+        return [dict(fields(i), id=int(rng.integers(1, 10 ** 6)), name=people[rng.integers(len(people))])
+                for i in range(size)]
+
+    def cast_blob():
+        return person_list(int(rng.integers(8, 30)), lambda i: {
+            'cast_id': i, 'character': ' '.join(rng.choice(word_pool, size=2)),
+            'credit_id': f"{rng.integers(16 ** 12):012x}", 'gender': int(rng.integers(0, 3)), 'order': i
+        })
+
+    def crew_blob():
+        crew = person_list(int(rng.integers(8, 40)), lambda i: {
+            'credit_id': f"{rng.integers(16 ** 12):012x}", 'department': 'Crew',
+            'gender': int(rng.integers(0, 3)), 'job': str(rng.choice(['Producer', 'Editor', 'Writer', 'Sound']))
+        })
+        crew[int(rng.integers(len(crew)))]['job'] = 'Director'
+        return crew
+
+    def name_list(names):
+        return [{'id': int(rng.integers(1, 10 ** 5)), 'name': str(name)} for name in names]
+
+    def encode(values):
+        # Satırların bir kısmı Python literal biçiminde (tek tırnaklı) yazılır
+        return repr(values) if rng.random() < LITERAL_ROW_RATIO else json.dumps(values)
+
+    cast_pool = [cast_blob() for _ in range(BLOB_POOL_SIZE)]
+    crew_pool = [crew_blob() for _ in range(BLOB_POOL_SIZE)]
+
+    rows = source_df.iloc[rng.integers(0, len(source_df), size=num_movies)].reset_index(drop=True)
+    movie_ids = np.arange(1, num_movies + 1)
+
+    movies_df = pd.DataFrame({
+        'id': movie_ids,
+        'title': rows['title'].astype(str) + ' #' + pd.Series(movie_ids).astype(str),
+        'overview': rows['plot_summary'],
+        'genres': [encode(name_list(rng.choice(genre_names, size=rng.integers(1, 4), replace=False)))
+                   for _ in range(num_movies)],
+        'keywords': [encode(name_list(rng.choice(word_pool, size=rng.integers(2, 10)))) for _ in range(num_movies)],
+        'production_companies': [encode(name_list(rng.choice(word_pool, size=rng.integers(1, 4))))
+                                 for _ in range(num_movies)],
+        'release_date': '2000-01-01',
+        'vote_average': np.round(rng.uniform(1, 10, size=num_movies), 1),
+        'vote_count': rng.integers(0, 20000, size=num_movies),
+        'popularity': np.round(rng.uniform(0, 200, size=num_movies), 3)
+    })
+
+    # Credits dosyası movies ile aynı sırada olmaz ve bazı filmlerin credits kaydı yoktur
+    credit_ids = rng.permutation(movie_ids)[:int(num_movies * 0.95)]
+    credits_df = pd.DataFrame({
+        'movie_id': credit_ids,
+        'title': '',
+        'cast': [encode(cast_pool[i]) for i in rng.integers(0, BLOB_POOL_SIZE, size=len(credit_ids))],
+        'crew': [encode(crew_pool[i]) for i in rng.integers(0, BLOB_POOL_SIZE, size=len(credit_ids))]
+    })
+
+    movies_path = os.path.join(output_dir, f'tmdb_movies_{num_movies}.csv')
+    credits_path = os.path.join(output_dir, f'tmdb_credits_{num_movies}.csv')
+    movies_df.to_csv(movies_path, index=False)
+    credits_df.to_csv(credits_path, index=False)
+    return movies_path, credits_path
+
+
+def _extract_names_legacy(json_str, key='name'):
+    """Eski sürüm: ast.literal_eval ile name değerleri"""
+    if pd.isna(json_str) or json_str == '[]':
+        return ''
+    try:
+        data = ast.literal_eval(json_str)
+        if isinstance(data, list):
+            return ', '.join([item.get(key, '') for item in data if isinstance(item, dict)])
+        return ''
+    except (ValueError, SyntaxError):
+        return ''
+
+
+def _get_director_legacy(crew_json):
+    """Eski sürüm: ast.literal_eval ile yönetmen"""
+    if pd.isna(crew_json) or crew_json == '[]':
+        return ''
+    try:
+        crew_data = ast.literal_eval(crew_json)
+        if isinstance(crew_data, list):
+            for person in crew_data:
+                if isinstance(person, dict) and person.get('job') == 'Director':
+                    return person.get('name', '')
+        return ''
+    except (ValueError, SyntaxError):
+        return ''
+
+
+def _get_main_actors_legacy(cast_json, max_actors=5):
+    """Eski sürüm: ast.literal_eval ile ana oyuncular"""
+    if pd.isna(cast_json) or cast_json == '[]':
+        return ''
+    try:
+        cast_data = ast.literal_eval(cast_json)
+        if isinstance(cast_data, list):
+            return ', '.join([person.get('name', '') for person in cast_data[:max_actors] if isinstance(person, dict)])
+        return ''
+    except (ValueError, SyntaxError):
+        return ''
+
+
+def _process_tmdb_dataset_legacy(movies_path: str, credits_path: str) -> pd.DataFrame:
+    """TMDBDataProcessor.process_tmdb_dataset'in eski iterrows + ast.literal_eval sürümü (karşılaştırma için)"""
+    movies_df = pd.read_csv(movies_path)
+    credits_df = pd.read_csv(credits_path)
+
+    crew_data, cast_data = {}, {}
+    for _, row in credits_df.iterrows():
+        crew_data[row['movie_id']] = row.get('crew', '[]')
+        cast_data[row['movie_id']] = row.get('cast', '[]')
+
+    processed_data = []
+    for _, row in movies_df.iterrows():
+        movie_id = row['id']
+        if movie_id in crew_data:
+            director = _get_director_legacy(crew_data[movie_id])
+            actors = _get_main_actors_legacy(cast_data[movie_id])
+        else:
+            director = actors = ''
+        overview = row.get('overview', '')
+
+        processed_data.append({
+            'movie_id': int(movie_id),
+            'title': row.get('title', ''),
+            'genres': _extract_names_legacy(row.get('genres', '[]')),
+            'director': director,
+            'actors': actors,
+            'plot_summary': overview if pd.notna(overview) else '',
+            'keywords': _extract_names_legacy(row.get('keywords', '[]')),
+            'companies': _extract_names_legacy(row.get('production_companies', '[]')),
+            'release_date': row.get('release_date', ''),
+            'vote_average': row.get('vote_average', 0),
+            'vote_count': row.get('vote_count', 0),
+            'popularity': row.get('popularity', 0)
+        })
+
+    return pd.DataFrame(processed_data).fillna('')
+
+
+def _timed(func, *args, **kwargs):
+    """Fonksiyonu çıktısı gizlenmiş olarak çalıştırır; (sonuç, saniye) döndürür"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def _dump_size_mb(movies_path: str, credits_path: str) -> float:
+    """Movies ve credits dosyalarının toplam boyutu (MB)"""
+    return (os.path.getsize(movies_path) + os.path.getsize(credits_path)) / 1024 ** 2
+
+
+def _write_name_edge_case_dump(tmp_dir: str) -> tuple:
+    """Boş, eksik ve null adlı kayıtlar içeren küçük bir TMDB dökümü yazar; (movies, credits) yollarını döndürür"""
+    movies_path = os.path.join(tmp_dir, 'tmdb_movies_names.csv')
+    credits_path = os.path.join(tmp_dir, 'tmdb_credits_names.csv')
+    pd.DataFrame({
+        'id': [1, 2, 3],
+        'title': ['Null Names', 'Empty Names', 'Clean'],
+        'overview': ['', '', ''],
+        'genres': [NULL_NAMES_JSON, EMPTY_NAMES_JSON, '[{"id": 3, "name": "Comedy"}]'],
+        'keywords': ['[]', '[{"id": 4}, {"id": 5, "name": "heist"}]', '[]'],
+        'production_companies': ['[{"name": null}]', '[]', '[]']
+    }).to_csv(movies_path, index=False)
+    pd.DataFrame({
+        'movie_id': [1, 2, 3],
+        'title': ['', '', ''],
+        'cast': [NULL_CAST_JSON, EMPTY_NAMES_JSON, '[]'],
+        'crew': [NULL_CREW_JSON, '[{"job": "Director", "name": ""}]', '[]']
+    }).to_csv(credits_path, index=False)
+    return movies_path, credits_path
+
+
+def check_name_edge_cases(tmp_dir: str):
+    """
+    Boş ve null adlı kayıtların işlenişini doğrular.
+
+    Boş veya eksik adlarda yeni çözücüler eski sürümle birebir aynı sonucu vermelidir. JSON null
+    içeren satırları eski sürüm ast.literal_eval ile çözemediği için tümden boş bırakıyordu; yeni
+    sürüm bu değerleri eksik anahtar gibi boş string sayar ve satırın geri kalanını korur.
+    """
+    print("\n🧪 Boş ve null adlı kayıtlar")
+    print("─" * 70)
+
+    extractors = [
+        ('extract_names_from_json', _extract_names_legacy, TMDBDataProcessor.extract_names_from_json),
+        ('get_director_from_crew', _get_director_legacy, TMDBDataProcessor.get_director_from_crew),
+        ('get_main_actors_from_cast', _get_main_actors_legacy, TMDBDataProcessor.get_main_actors_from_cast)
+    ]
+
+    # Boş/eksik adlar: eski sürümle parite
+    cases = []
+    for value in [EMPTY_NAMES_JSON, '[{"id": 1}, {"id": 2, "name": "A"}]', '[{"job": "Director", "name": ""}]',
+                  "[{'id': 1, 'name': ''}, {'id': 2, 'name': 'A'}]"]:
+        for label, legacy, new in extractors:
+            cases.append((f"{label} {value[:40]}", new(value), legacy(value)))
+
+    # Null adlar: eski sürüm satırı boş bırakırdı; yeni sürümün beklenen sonucu
+    cases += [
+        ('extract_names_from_json null', TMDBDataProcessor.extract_names_from_json(NULL_NAMES_JSON), ', Drama'),
+        ('get_director_from_crew null', TMDBDataProcessor.get_director_from_crew(NULL_CREW_JSON), ''),
+        ('get_main_actors_from_cast null', TMDBDataProcessor.get_main_actors_from_cast(NULL_CAST_JSON),
+         'Actor A, , Actor B')
+    ]
+
+    movies_path, credits_path = _write_name_edge_case_dump(tmp_dir)
+    columns = ['genres', 'keywords', 'companies', 'director', 'actors']
+    for label, kwargs in [('process_tmdb_dataset', {}), ('process_tmdb_dataset workers=2', {'workers': 2})]:
+        df, _ = _timed(TMDBDataProcessor.process_tmdb_dataset, movies_path, credits_path, **kwargs)
+        cases.append((label, list(df[columns].itertuples(index=False, name=None)), NAME_EDGE_CASE_EXPECTED))
+
+    output_path = os.path.join(tmp_dir, 'processed_names.csv')
+    _timed(TMDBDataProcessor.process_tmdb_dataset_streaming, movies_path, output_path, credits_path)
+    streamed = pd.read_csv(output_path, keep_default_na=False)
+    cases.append(('process_tmdb_dataset_streaming',
+                  list(streamed[['genres', 'director', 'actors']].itertuples(index=False, name=None)),
+                  [(genres, director, actors) for genres, _, _, director, actors in NAME_EDGE_CASE_EXPECTED]))
+
+    for label, result, expected in cases:
+        print(f"   {'✅' if result == expected else '❌'} {label}")
+        if result != expected:
+            raise AssertionError(f"{label}: beklenen {expected!r}, bulunan {result!r}")
+
+
+def benchmark_parsing(dumps: list):
+    """Eski (iterrows + ast.literal_eval) ve yeni (sütun bazlı json.loads) işlemeyi karşılaştırır"""
+    print("\n🧩 TMDB işleme: iterrows + ast.literal_eval (eski) vs sütun bazlı json.loads (yeni)")
+    print("─" * 70)
+    print(f"{'Film':>8} | {'Döküm MB':>9} | {'Eski sn':>8} | {'Yeni sn':>8} | {'Hızlanma':>8} | {'Aynı sonuç':>10}")
+
+    for size, movies_path, credits_path in dumps:
+        dump_mb = _dump_size_mb(movies_path, credits_path)
+
+        legacy_df, legacy_s = _timed(_process_tmdb_dataset_legacy, movies_path, credits_path)
+        new_df, new_s = _timed(TMDBDataProcessor.process_tmdb_dataset, movies_path, credits_path)
+
+        same = legacy_df.equals(new_df.reset_index(drop=True))
+        print(f"{size:>8} | {dump_mb:>9.1f} | {legacy_s:>8.2f} | {new_s:>8.2f} | "
+              f"{legacy_s / max(new_s, 1e-9):>7.1f}x | {str(same):>10}")
+
+        if not same:
+            raise AssertionError("Yeni işleme sonucu eski sürümle aynı değil")
+
+
+def _process_in_child(streaming: bool, movies_path: str, credits_path: str, output_path: str,
+                      chunksize: int) -> tuple:
+    """Ayrı bir süreçte dökümü işler; (saniye, sürecin tepe belleği MB) döndürür"""
+    if streaming:
+        _, elapsed_s = _timed(TMDBDataProcessor.process_tmdb_dataset_streaming,
+                              movies_path, output_path, credits_path, chunksize)
+    else:
+        def process_in_memory():
+            df = TMDBDataProcessor.process_tmdb_dataset(movies_path, credits_path)
+            TMDBDataProcessor.save_processed_dataset(df, output_path)
+        _, elapsed_s = _timed(process_in_memory)
+
+    return elapsed_s, _peak_memory_mb()
+
+
+def _peak_memory_mb() -> float:
+    """Sürecin tepe bellek kullanımı (MB)"""
+    # ru_maxrss exec sonrasında üst sürecin değerini korur; Linux'ta VmHWM yalnızca bu süreci ölçer
+    try:
+        with open('/proc/self/status') as status_file:
+            for line in status_file:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _measure_in_subprocess(*args) -> tuple:
+    """Tepe belleğin önceki ölçümlerden etkilenmemesi için işlemeyi temiz bir süreçte çalıştırır"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+        return executor.submit(_process_in_child, *args).result()
+
+
+def benchmark_streaming(dumps: list, tmp_dir: str, chunksize: int = 10000):
+    """Tüm dosyayı belleğe alan işleme ile parça parça (streaming) işlemenin süreç tepe belleğini karşılaştırır"""
+    print(f"\n🌊 Bellek: tüm döküm bellekte (eski) vs parça parça, chunksize={chunksize} (yeni)")
+    print("─" * 70)
+    print(f"{'Film':>8} | {'Döküm MB':>9} | {'Eski tepe MB':>12} | {'Yeni tepe MB':>12} | "
+          f"{'Eski sn':>8} | {'Yeni sn':>8} | {'Aynı çıktı':>10}")
+
+    in_memory_path = os.path.join(tmp_dir, 'processed_in_memory.csv')
+    streaming_path = os.path.join(tmp_dir, 'processed_streaming.csv')
+
+    for size, movies_path, credits_path in dumps:
+        in_memory_s, in_memory_mb = _measure_in_subprocess(False, movies_path, credits_path, in_memory_path, chunksize)
+        streaming_s, streaming_mb = _measure_in_subprocess(True, movies_path, credits_path, streaming_path, chunksize)
+
+        with open(in_memory_path, 'rb') as in_memory_file, open(streaming_path, 'rb') as streaming_file:
+            same = in_memory_file.read() == streaming_file.read()
+
+        print(f"{size:>8} | {_dump_size_mb(movies_path, credits_path):>9.1f} | {in_memory_mb:>12.1f} | "
+              f"{streaming_mb:>12.1f} | {in_memory_s:>8.2f} | {streaming_s:>8.2f} | {str(same):>10}")
+
+        if not same:
+            raise AssertionError("Parça parça işlemenin çıktısı tüm dosyayı işleyen sürümle aynı değil")
+
+
+def benchmark_workers(dumps: list, worker_counts: tuple = (1, 2, 4)):
+    """İşçi sayısına göre JSON çözme verimini (film/sn) ve tek sürece göre ölçeklenmeyi ölçer"""
+    print(f"\n⚡ Paralel çözme: workers={'/'.join(str(count) for count in worker_counts)} "
+          f"(makinedeki CPU sayısı: {os.cpu_count()})")
+    print("─" * 70)
+    print(f"{'Film':>8} | {'İşçi':>5} | {'Süre sn':>8} | {'Film/sn':>9} | {'Ölçeklenme':>10} | {'Aynı sonuç':>10}")
+
+    for size, movies_path, credits_path in dumps:
+        baseline_df, baseline_s = None, None
+
+        for workers in worker_counts:
+            df, elapsed_s = _timed(TMDBDataProcessor.process_tmdb_dataset, movies_path, credits_path, workers=workers)
+
+            if baseline_df is None:
+                baseline_df, baseline_s = df, elapsed_s
+            same = baseline_df.equals(df)
+
+            print(f"{size:>8} | {workers:>5} | {elapsed_s:>8.2f} | {size / max(elapsed_s, 1e-9):>9.0f} | "
+                  f"{baseline_s / max(elapsed_s, 1e-9):>9.2f}x | {str(same):>10}")
+
+            if not same:
+                raise AssertionError("Paralel işleme sonucu tek süreçli işlemeyle aynı değil")
+
+
+def main():
+    """Ana benchmark fonksiyonu"""
+    print("⏱️  TMDBDataProcessor Performans Ölçümleri")
+    print("=" * 50)
+
+    sizes = [int(size) for size in sys.argv[1:]] or DEFAULT_SIZES
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        check_name_edge_cases(tmp_dir)
+
+        dumps = [(size, *create_synthetic_tmdb_dump(SOURCE_DATASET, size, tmp_dir)) for size in sizes]
+
+        benchmark_parsing(dumps)
+
+        benchmark_streaming(dumps, tmp_dir)
+
+        benchmark_workers(dumps)
+
+    print("\n✅ Ölçümler tamamlandı!")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,263 @@ Film İzleme Sayacı - İçerik Bazlı Film Önerme Sistemi
 Bu modül, kullanıcının izlediği filmlere dayanarak benzer filmleri önerir.
 """
 
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import unicodedata
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from typing import List, Union, Dict, Any
+from typing import List, Union, Dict, Any, Optional, Tuple, NamedTuple
+
+
+class Recommendation(NamedTuple):
+    """Tek bir öneri için hafif kayıt (result_format='record')."""
+    movie_id: int
+    title: str
+    genres: str
+    director: str
+    similarity_score: float
+
+
+class UserProfile:
+    """
+    Kullanıcının izlediği filmlerden artımlı olarak güncellenen zevk profili.
+    
+    Ağırlıklı TF-IDF toplamı yoğun bir özellik vektöründe, ağırlık toplamı ayrı tutulur; film
+    eklemek veya çıkarmak yalnızca o filmin sıfır olmayan değerlerine dokunur. Profil doğrudan
+    get_recommendations'a verilebilir, böylece tur başına maliyet izleme geçmişiyle büyümez.
+    Öneri sisteminin modeli değişirse (yeniden eğitim, katalog güncellemesi) toplamlar bir kez
+    baştan hesaplanır; katalogdan çıkarılmış filmler bu sırada profilden düşer.
+    """
+    
+    def __init__(self, recommender: 'ContentBasedRecommender', movie_ids: Optional[List[int]] = None):
+        """
+        UserProfile sınıfını başlatır.
+        
+        Args:
+            recommender (ContentBasedRecommender): Profilin ait olduğu öneri sistemi
+            movie_ids (Optional[List[int]]): Başlangıçta profile eklenecek film ID'leri
+        """
+        self.recommender = recommender
+        self.movie_counts = Counter()
+        self._reset_sums()
+        
+        for movie_id in movie_ids or []:
+            self.add_movie(movie_id)
+    
+    @property
+    def movie_ids(self) -> List[int]:
+        """Profildeki film ID'leri (birden fazla eklenen film tekrar eder)."""
+        self._sync()
+        return list(self.movie_counts.elements())
+    
+    def __len__(self) -> int:
+        self._sync()
+        return sum(self.movie_counts.values())
+    
+    def add_movie(self, movie_id: int):
+        """
+        Filmi profile ekler.
+        
+        Args:
+            movie_id (int): Eklenecek film ID'si
+        """
+        self._sync()
+        self._apply_movie(movie_id, 1.0)
+        self.movie_counts[movie_id] += 1
+    
+    def remove_movie(self, movie_id: int):
+        """
+        Filmi profilden çıkarır (birden fazla eklendiyse bir kez).
+        
+        Args:
+            movie_id (int): Çıkarılacak film ID'si
+        """
+        self._sync()
+        if self.movie_counts[movie_id] <= 0:
+            raise ValueError(f"Film ID {movie_id} profilde yok")
+        
+        self._apply_movie(movie_id, -1.0)
+        self.movie_counts[movie_id] -= 1
+        if self.movie_counts[movie_id] == 0:
+            del self.movie_counts[movie_id]
+        
+        # Boşalan profilde birikmiş yuvarlama hatalarını temizle
+        if not self.movie_counts:
+            self._reset_sums()
+    
+    def to_vector(self) -> sparse.csr_matrix:
+        """
+        Profili öneri sisteminin skorlamada kullandığı 1 x özellik seyrek vektöre çevirir.
+        
+        Returns:
+            sparse.csr_matrix: Ağırlıklı ortalama TF-IDF vektörü
+        """
+        self._sync()
+        if not self.movie_counts:
+            raise ValueError("Profil boş")
+        
+        profile_values = (self.weighted_sum / self.weight_total).astype(self.recommender.tfidf_matrix.dtype)
+        return sparse.csr_matrix(profile_values.reshape(1, -1))
+    
+    def _reset_sums(self):
+        """Toplamları sıfırlar ve profili öneri sisteminin güncel model sürümüne bağlar."""
+        self.weighted_sum = np.zeros(self.recommender.tfidf_matrix.shape[1])
+        self.weight_total = 0.0
+        self.model_version = self.recommender.model_version
+    
+    def _apply_movie(self, movie_id: int, sign: float):
+        """Filmin ağırlıklı TF-IDF satırını toplama ekler (sign=1) veya toplamdan çıkarır (sign=-1)."""
+        index = self.recommender._id_to_index.get(movie_id)
+        if index is None:
+            raise ValueError(f"Film ID {movie_id} bulunamadı")
+        
+        matrix = self.recommender.tfidf_matrix
+        start, end = matrix.indptr[index], matrix.indptr[index + 1]
+        weight = float(self.recommender._get_movie_weights([index])[0])
+        
+        self.weighted_sum[matrix.indices[start:end]] += sign * weight * matrix.data[start:end]
+        self.weight_total += sign * weight
+    
+    def _sync(self):
+        """Öneri sisteminin modeli değiştiyse toplamları güncel model üzerinden yeniden hesaplar."""
+        if self.model_version == self.recommender.model_version:
+            return
+        
+        movie_counts = self.movie_counts
+        self.movie_counts = Counter()
+        self._reset_sums()
+        
+        for movie_id, count in movie_counts.items():
+            if movie_id not in self.recommender._id_to_index:
+                continue
+            for _ in range(count):
+                self._apply_movie(movie_id, 1.0)
+            self.movie_counts[movie_id] = count
+
+
+class RecommendationCursor:
+    """
+    Bir izleme listesi için bir kez skorlanmış, sıralı öneri adayları üzerinde sayfa sayfa ilerler.
+    
+    Oluşturulurken tüm katalog bir kez skorlanır ve pozitif skorlu adaylar sıralanır; her sayfa
+    bu sıradan yalnızca sayfa boyutu kadar aday okur. Hariç tutulan filmler katalog uzunluğunda
+    bir boolean maske ile elenir. İmleç kullanıcı profili veya model değişince eskir.
+    """
+    
+    def __init__(self, recommender: 'ContentBasedRecommender', ranked_indices: np.ndarray, ranked_scores: np.ndarray,
+                 watched_key: frozenset, user_profile: Optional[UserProfile] = None,
+                 result_format: str = 'dict'):
+        """
+        RecommendationCursor sınıfını başlatır.
+        
+        Args:
+            recommender (ContentBasedRecommender): İmlecin ait olduğu öneri sistemi
+            ranked_indices (np.ndarray): Skora göre azalan sırada aday satır pozisyonları
+            ranked_scores (np.ndarray): Aynı sırada benzerlik skorları
+            watched_key (frozenset): İmlecin oluşturulduğu izleme listesinin (film ID, adet) çiftleri
+            user_profile (Optional[UserProfile]): İmleç bir profilden oluşturulduysa o profil
+            result_format (str): Sayfaların biçimi ('dict', 'record' veya 'dataframe')
+        """
+        self.recommender = recommender
+        self.result_format = result_format
+        self.watched_key = watched_key
+        self.user_profile = user_profile
+        self.model_version = recommender.model_version
+        self.position = 0
+        
+        self._ranked_indices = ranked_indices
+        self._ranked_scores = ranked_scores
+        self._excluded = np.zeros(recommender.tfidf_matrix.shape[0], dtype=bool)
+    
+    @property
+    def is_stale(self) -> bool:
+        """Model veya imlecin oluşturulduğu profil değiştiyse True."""
+        if self.model_version != self.recommender.model_version:
+            return True
+        if self.user_profile is not None:
+            return frozenset(Counter(self.user_profile.movie_ids).items()) != self.watched_key
+        return False
+    
+    @property
+    def has_more(self) -> bool:
+        """Sırada okunmamış aday kaldıysa True (hariç tutulanlar da sayılır)."""
+        return self.position < len(self._ranked_indices)
+    
+    def exclude(self, movie_ids: List[int]):
+        """
+        Filmleri sonraki sayfalardan çıkarır (ör. başka yoldan gösterilmiş öneriler).
+        
+        Args:
+            movie_ids (List[int]): Çıkarılacak film ID'leri (katalogda olmayanlar yok sayılır)
+        """
+        indices, _ = self.recommender._lookup_movie_indices(list(movie_ids))
+        self._excluded[indices] = True
+    
+    def next_page(self, page_size: int = 10) -> Union[List[Dict[str, Any]], List[Recommendation], pd.DataFrame]:
+        """
+        Sıradaki öneri sayfasını döndürür; katalog yeniden skorlanmaz.
+        
+        Args:
+            page_size (int): Sayfadaki öneri sayısı (varsayılan: 10)
+            
+        Returns:
+            Union[List[Dict[str, Any]], List[Recommendation], pd.DataFrame]: Öneriler (adaylar
+                tükendiyse daha kısa veya boş)
+        """
+        if page_size <= 0:
+            raise ValueError("Sayfa boyutu pozitif olmalıdır")
+        
+        if self.is_stale:
+            raise ValueError("Profil veya model değişti; yeni bir öneri imleci oluşturun")
+        
+        # Hariç tutulanlar elendikçe sayfa dolana kadar sıradaki adayları oku
+        selected = []
+        num_selected = 0
+        while num_selected < page_size and self.has_more:
+            end = min(self.position + page_size - num_selected, len(self._ranked_indices))
+            window = self.position + np.flatnonzero(~self._excluded[self._ranked_indices[self.position:end]])
+            selected.append(window)
+            num_selected += len(window)
+            self.position = end
+        
+        positions = np.concatenate(selected) if selected else np.empty(0, dtype=np.intp)
+        return self.recommender._build_recommendations(
+            self._ranked_indices[positions], self._ranked_scores[positions], self.result_format
+        )
+
+
+# Süreç havuzu işçisinin tuttuğu katalog bölümü (bkz. ContentBasedRecommender.enable_sharding)
+_WORKER_SHARD = None
+
+
+def _init_shard_worker(shard_matrix: sparse.csr_matrix):
+    """Süreç havuzu işçisine kataloğun bir satır bölümünü yükler."""
+    global _WORKER_SHARD
+    _WORKER_SHARD = shard_matrix
+
+
+def _score_shard(shard_matrix: sparse.csr_matrix, profile_values: np.ndarray, profile_norm: float,
+                 exclude_indices: np.ndarray, k: int,
+                 allowed_mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Bir katalog bölümünü skorlar; bölümdeki en iyi k filmin yerel pozisyonlarını ve skorlarını döndürür."""
+    scores = (shard_matrix @ profile_values) / profile_norm
+    top_indices = ContentBasedRecommender._select_top_k(scores, k, exclude_indices, allowed_mask)
+    return top_indices, scores[top_indices]
+
+
+def _score_worker_shard(profile_values: np.ndarray, profile_norm: float, exclude_indices: np.ndarray,
+                        k: int, allowed_mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Süreç havuzu işçisinde, işçinin tuttuğu bölümü skorlar."""
+    return _score_shard(_WORKER_SHARD, profile_values, profile_norm, exclude_indices, k, allowed_mask)
 
 
 class ContentBasedRecommender:
@@ -18,204 +270,2130 @@ class ContentBasedRecommender:
     kullanıcının izlediği filmlere benzer filmler önerir.
     """
     
-    def __init__(self, movie_data_path: str):
+    # Model artefaktının disk formatı; format değiştiğinde eski önbellekler geçersiz sayılır
+    MODEL_FORMAT_VERSION = 2
+    
+    # Komşu tablosu hızlı yolunun kullanılacağı en fazla başlangıç filmi sayısı
+    NEIGHBOR_SEED_LIMIT = 3
+    
+    # Eklenen filmlerdeki sözlük dışı terim oranı, eğitim korpusuna göre bu kadar artarsa
+    # TF-IDF modeli yeniden eğitilir
+    VOCABULARY_DRIFT_THRESHOLD = 0.1
+    
+    # Öneri ve arama sonuçlarında gösterilen sütunlar
+    RESULT_COLUMNS = ['movie_id', 'title', 'genres', 'director']
+    
+    # Aralık filtreleri: filtre anahtarı -> (sayısal sütun, alt veya üst sınır).
+    # Bu veri setinde sayısal sütun olmadığı için boştur.
+    RANGE_FILTERS = {}
+    
+    # Kategori filtreleri: virgülle ayrılmış değer listesi tutan sütunlar
+    CATEGORY_FILTERS = ['genres']
+    
+    # Başlık aramasında indekslenen sütunlar ve indeksin n-gram uzunluğu
+    SEARCH_COLUMNS = ['title']
+    SEARCH_NGRAM = 3
+    
+    # Bulanık aramada kelime uzunluğuna göre izin verilen en fazla düzenleme (harf ekleme/silme/değiştirme):
+    # (en az uzunluk, düzenleme) çiftleri; daha kısa kelimeler tam eşleşmelidir
+    FUZZY_EDIT_LIMITS = [(8, 2), (4, 1)]
+    
+    # Önerilerin döndürülebileceği biçimler
+    RESULT_FORMATS = ('dict', 'record', 'dataframe')
+    
+    # TF-IDF matrisi için desteklenen veri tipleri (float32 belleği yarıya indirir)
+    MATRIX_DTYPES = ('float64', 'float32')
+    
+    # TF-IDF parametreleri (önbellek anahtarının bir parçasıdır)
+    VECTORIZER_PARAMS = {
+        'stop_words': 'english',
+        'max_features': 5000,  # Performans için özellik sayısını sınırla
+        'ngram_range': (1, 2)  # Unigram ve bigram kullan
+    }
+    
+    def __init__(self, movie_data_path: str, model_cache_dir: Optional[str] = None,
+                 matrix_dtype: str = 'float64', mmap: bool = False, cache_size: int = 128):
         """
         ContentBasedRecommender sınıfını başlatır.
         
         Args:
             movie_data_path (str): Film verilerini içeren CSV dosyasının yolu
+            model_cache_dir (Optional[str]): Eğitilmiş model artefaktlarının saklanacağı dizin.
+                Verilirse CSV içeriği ve TF-IDF parametrelerinin hash'i ile anahtarlanmış bir
+                artefakt aranır; katalog değişmediyse model diskten yüklenir, değiştiyse
+                yeniden eğitilip kaydedilir.
+            matrix_dtype (str): TF-IDF matrisinin veri tipi ('float64' veya 'float32').
+                'float32' seçilirse matris, skorlama ve kayıtlı artefakt float32 olur; indeks
+                dizileri her iki durumda da mümkünse int32'ye sıkıştırılır.
+            mmap (bool): True ise TF-IDF matrisinin CSR dizileri ve sayısal sütunlar artefakttan
+                salt okunur olarak bellek eşlenir (np.load(mmap_mode='r')); aynı artefaktı açan
+                işçi süreçler tek bir sayfa önbelleği kopyasını paylaşır. model_cache_dir gerektirir.
+            cache_size (int): Bellekte tutulacak en fazla öneri sonucu sayısı (LRU); 0 önbelleği kapatır
         """
+        if matrix_dtype not in self.MATRIX_DTYPES:
+            raise ValueError(f"Geçersiz matris veri tipi: {matrix_dtype} (desteklenenler: {', '.join(self.MATRIX_DTYPES)})")
+        
+        if mmap and not model_cache_dir:
+            raise ValueError("Bellek eşlemeli yükleme için model_cache_dir verilmelidir")
+        
+        if cache_size < 0:
+            raise ValueError("Önbellek boyutu negatif olamaz")
+        
         try:
-            # CSV dosyasını DataFrame'e yükle
-            self.df = pd.read_csv(movie_data_path)
-              # Gerekli sütunların varlığını kontrol et
-            required_columns = ['movie_id', 'title', 'genres', 'plot_summary']
-            missing_columns = [col for col in required_columns if col not in self.df.columns]
-            if missing_columns:
-                raise ValueError(f"CSV dosyasında eksik sütunlar: {missing_columns}")
-            
-            # Director ve actors sütunları yoksa boş ekle
-            if 'director' not in self.df.columns:
-                self.df['director'] = ''
-            if 'actors' not in self.df.columns:
-                self.df['actors'] = ''
-            
-            # Eksik değerleri boş string ile doldur
-            feature_columns = ['genres', 'director', 'actors', 'plot_summary']
-            for col in feature_columns:
-                self.df[col] = self.df[col].fillna('')
-            
-            # Tüm önemli metin verilerini birleştirerek features sütunu oluştur
-            self.df['features'] = (
-                self.df['genres'] + ' ' +
-                self.df['director'] + ' ' +
-                self.df['actors'] + ' ' +
-                self.df['plot_summary']
-            )
+            self.matrix_dtype = np.dtype(matrix_dtype)
+            self.mmap = mmap
+            self.model_key = None
+            self.model_dir = None
+            self.neighbor_indices = None
+            self.neighbor_scores = None
+            self.ann_index = None
+            self.ann_n_probe = 16
+            self._shard_settings = None
+            self._shards = []
+            self._shard_executors = []
             
-            # TF-IDF vektörleştirici oluştur
-            self.tfidf_vectorizer = TfidfVectorizer(
-                stop_words='english',
-                max_features=5000,  # Performans için özellik sayısını sınırla
-                ngram_range=(1, 2)  # Unigram ve bigram kullan
-            )
+            # Öneri sonuçları için LRU önbellek; anahtar model sürümünü de içerir
+            self.cache_size = cache_size
+            self.model_version = 0
+            self.cache_hits = 0
+            self.cache_misses = 0
+            self._recommendation_cache = OrderedDict()
+            self._reset_drift_tracking()
+            loaded_from_cache = False
+            
+            if model_cache_dir:
+                self.model_key = self._compute_model_key(movie_data_path, matrix_dtype)
+                self.model_dir = os.path.join(model_cache_dir, self.model_key)
+                loaded_from_cache = self._load_model(self.model_dir)
+            
+            if loaded_from_cache:
+                print(f"⚡ Model önbellekten yüklendi: {len(self.df)} film, {self.tfidf_matrix.shape[1]} özellik")
+            else:
+                # CSV dosyasını yükle ve temizle
+                self.df = self._load_dataframe(movie_data_path)
+                
+                # TF-IDF modelini eğit
+                self._fit_model()
+                
+                print(f"✅ Başarıyla yüklendi: {len(self.df)} film, {self.tfidf_matrix.shape[1]} özellik")
+                
+                if self.model_dir:
+                    self.save_model(self.model_dir)
+                    
+                    # Yeni kaydedilen artefaktı da bellek eşlemeli aç (diğer işçilerle aynı sayfalar)
+                    if self.mmap:
+                        self._load_model(self.model_dir)
             
-            # Features sütununu TF-IDF matrisine dönüştür
-            self.tfidf_matrix = self.tfidf_vectorizer.fit_transform(self.df['features'])
+            # Film ID'si -> satır pozisyonu gibi yardımcı indeksleri kur
+            self._rebuild_catalog_indexes()
             
-            print(f"✅ Başarıyla yüklendi: {len(self.df)} film, {self.tfidf_matrix.shape[1]} özellik")
+            memory_report = self.get_memory_report()
+            print(f"💾 TF-IDF matrisi: {memory_report['matrix_bytes'] / 1024 ** 2:.1f} MB "
+                  f"(float64/int64 düzene göre {memory_report['saved_bytes'] / 1024 ** 2:.1f} MB tasarruf)")
             
         except FileNotFoundError:
             raise FileNotFoundError(f"CSV dosyası bulunamadı: {movie_data_path}")
         except Exception as e:
             raise Exception(f"Başlatma hatası: {str(e)}")
     
-    def _get_user_profile(self, watched_movie_indices: List[int]) -> np.ndarray:
+    def _load_dataframe(self, movie_data_path: str) -> pd.DataFrame:
         """
-        Kullanıcının izlediği filmlere dayanarak kullanıcı profil vektörü oluşturur.
+        CSV dosyasını okur ve temizler.
         
         Args:
-            watched_movie_indices (List[int]): İzlenen filmlerin DataFrame indeksleri
+            movie_data_path (str): Film verilerini içeren CSV dosyasının yolu
             
         Returns:
-            np.ndarray: Kullanıcının zevk profilini temsil eden vektör
+            pd.DataFrame: Temizlenmiş film verileri
         """
-        if not watched_movie_indices:
-            raise ValueError("İzlenen film listesi boş olamaz")
+        # CSV dosyasını DataFrame'e yükle
+        return self._prepare_dataframe(pd.read_csv(movie_data_path))
+    
+    def _prepare_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Ham film verilerinin eksik sütunlarını tamamlar ve features sütununu oluşturur.
         
-        # İzlenen filmlerin TF-IDF vektörlerini al
-        watched_vectors = self.tfidf_matrix[watched_movie_indices]
+        Args:
+            df (pd.DataFrame): Ham film verileri (CSV ile aynı sütunlar)
+            
+        Returns:
+            pd.DataFrame: Temizlenmiş film verileri
+        """
+        # Gerekli sütunların varlığını kontrol et
+        required_columns = ['movie_id', 'title', 'genres', 'plot_summary']
+        missing_columns = [col for col in required_columns if col not in df.columns]
+        if missing_columns:
+            raise ValueError(f"CSV dosyasında eksik sütunlar: {missing_columns}")
         
-        # Vektörlerin ortalamasını al (kullanıcı profili)
-        user_profile_vector = np.mean(watched_vectors.toarray(), axis=0)
+        # Director ve actors sütunları yoksa boş ekle
+        if 'director' not in df.columns:
+            df['director'] = ''
+        if 'actors' not in df.columns:
+            df['actors'] = ''
+        
+        # Eksik değerleri boş string ile doldur
+        feature_columns = ['genres', 'director', 'actors', 'plot_summary']
+        for col in feature_columns:
+            df[col] = df[col].fillna('')
+        
+        # Tüm önemli metin verilerini birleştirerek features sütunu oluştur
+        df['features'] = (
+            df['genres'] + ' ' +
+            df['director'] + ' ' +
+            df['actors'] + ' ' +
+            df['plot_summary']
+        )
         
-        return user_profile_vector
+        return df
     
-    def get_recommendations(self, watched_movie_ids: List[int], num_recommendations: int = 10) -> List[Dict[str, Any]]:
+    def _fit_model(self):
+        """TF-IDF vektörleştiriciyi mevcut katalog üzerinde (yeniden) eğitir."""
+        # TF-IDF vektörleştirici oluştur
+        self.tfidf_vectorizer = TfidfVectorizer(**self.VECTORIZER_PARAMS, dtype=self.matrix_dtype)
+        
+        # Features sütununu TF-IDF matrisine dönüştür
+        self.tfidf_matrix = self._compact_matrix(self.tfidf_vectorizer.fit_transform(self.df['features']))
+        
+        self._reset_drift_tracking()
+    
+    @classmethod
+    def _compute_model_key(cls, movie_data_path: str, matrix_dtype: str = 'float64') -> str:
         """
-        Kullanıcının izlediği filmlere dayanarak film önerileri üretir.
+        CSV içeriği, vektörleştirici parametreleri ve matris veri tipinden model anahtarı üretir.
         
         Args:
-            watched_movie_ids (List[int]): Kullanıcının izlediği filmlerin ID'leri
-            num_recommendations (int): Önerilecek film sayısı (varsayılan: 10)
+            movie_data_path (str): Film verilerini içeren CSV dosyasının yolu
+            matrix_dtype (str): TF-IDF matrisinin veri tipi
             
         Returns:
-            List[Dict[str, Any]]: Önerilen filmlerin bilgilerini içeren liste
+            str: SHA-256 tabanlı artefakt anahtarı
         """
-        if not watched_movie_ids:
-            raise ValueError("İzlenen film ID listesi boş olamaz")
+        hasher = hashlib.sha256()
         
-        if num_recommendations <= 0:
-            raise ValueError("Öneri sayısı pozitif olmalıdır")
+        # CSV dosyasını parça parça hash'le (büyük kataloglarda belleği şişirmemek için)
+        with open(movie_data_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                hasher.update(block)
         
-        # İzlenen film ID'lerinin DataFrame'deki indekslerini bul
-        watched_movie_indices = []
-        found_movies = []
+        # Parametreler veya format değişirse anahtar da değişmeli
+        settings = {
+            'format_version': cls.MODEL_FORMAT_VERSION,
+            'vectorizer_params': cls.VECTORIZER_PARAMS,
+            'matrix_dtype': str(matrix_dtype)
+        }
+        hasher.update(json.dumps(settings, sort_keys=True, default=str).encode('utf-8'))
         
-        for movie_id in watched_movie_ids:
-            indices = self.df[self.df['movie_id'] == movie_id].index.tolist()
-            if indices:
-                watched_movie_indices.extend(indices)
-                found_movies.append(movie_id)
-            else:
-                print(f"⚠️  Film ID {movie_id} veri setinde bulunamadı")
+        return hasher.hexdigest()[:32]
+    
+    def _compact_matrix(self, matrix: sparse.spmatrix) -> sparse.csr_matrix:
+        """
+        Matrisi seçilen veri tipine ve (sığıyorsa) int32 indeks/indptr dizilerine dönüştürür.
         
-        if not watched_movie_indices:
-            raise ValueError("Hiçbir izlenen film veri setinde bulunamadı")
+        Args:
+            matrix (sparse.spmatrix): TF-IDF matrisi
+            
+        Returns:
+            sparse.csr_matrix: Kompakt CSR matris
+        """
+        matrix = sparse.csr_matrix(matrix, dtype=self.matrix_dtype)
         
-        print(f"📊 Profil oluşturuluyor: {len(found_movies)} film kullanılıyor")
+        int32_max = np.iinfo(np.int32).max
+        if matrix.nnz <= int32_max and matrix.shape[1] <= int32_max:
+            matrix.indices = matrix.indices.astype(np.int32, copy=False)
+            matrix.indptr = matrix.indptr.astype(np.int32, copy=False)
         
-        # Kullanıcı profil vektörünü hesapla
-        user_profile_vector = self._get_user_profile(watched_movie_indices)
+        return matrix
+    
+    def get_memory_report(self) -> Dict[str, int]:
+        """
+        TF-IDF matrisinin bellek kullanımını varsayılan float64 veri / int64 indeks düzeniyle karşılaştırır.
+        
+        Returns:
+            Dict[str, int]: matrix_bytes (mevcut), baseline_bytes (float64/int64) ve saved_bytes
+        """
+        matrix = self.tfidf_matrix
+        matrix_bytes = matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+        baseline_bytes = matrix.nnz * (8 + 8) + len(matrix.indptr) * 8
         
-        # Tüm filmlerle benzerlik skorlarını hesapla
-        similarity_scores = cosine_similarity([user_profile_vector], self.tfidf_matrix)[0]
+        return {
+            'matrix_bytes': int(matrix_bytes),
+            'baseline_bytes': int(baseline_bytes),
+            'saved_bytes': int(baseline_bytes - matrix_bytes)
+        }
+    
+    def save_model(self, model_dir: str):
+        """
+        Eğitilmiş modeli (sözlük, idf ağırlıkları, TF-IDF matrisi, temiz veriler) diske kaydeder.
         
-        # Film indeksleri ile benzerlik skorlarını eşleştir
-        movie_similarities = list(enumerate(similarity_scores))
+        Dosyalar önce geçici bir dizine yazılır ve tek adımda yerine taşınır; böylece aynı
+        anda başlayan süreçler yarım yazılmış bir artefakt görmez. add_movies/remove_movies
+        sonrası kaydedilen artefaktlar CSV'ye karşılık gelmez; bunlar load_model ile yüklenir.
         
-        # Benzerlik skoruna göre sırala (en yüksekten en düşüğe)
-        movie_similarities.sort(key=lambda x: x[1], reverse=True)
+        Args:
+            model_dir (str): Artefakt dizini
+        """
+        # Sözlük kayması nedeniyle planlanmış yeniden eğitim kayıttan önce yapılır; aksi halde
+        # artefakt bu örneğin bir sonraki öneride kullanacağı modelden farklı olur
+        self._apply_pending_refit()
         
-        # İzlenen filmleri çıkar ve önerileri topla
-        recommendations = []
-        seen_movie_ids = set(watched_movie_ids)
+        parent_dir = os.path.dirname(os.path.abspath(model_dir))
+        os.makedirs(parent_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix='.tmp_model_', dir=parent_dir)
         
-        for movie_index, similarity_score in movie_similarities:
-            movie_id = self.df.iloc[movie_index]['movie_id']
+        try:
+            vocabulary = {term: int(index) for term, index in self.tfidf_vectorizer.vocabulary_.items()}
+            with open(os.path.join(tmp_dir, 'vocabulary.json'), 'w', encoding='utf-8') as f:
+                json.dump(vocabulary, f, ensure_ascii=False)
             
-            # İzlenen filmler listesinde değilse ve skor 0'dan büyükse ekle
-            if movie_id not in seen_movie_ids and similarity_score > 0:
-                recommendation = {
-                    'movie_id': int(movie_id),
-                    'title': self.df.iloc[movie_index]['title'],
-                    'genres': self.df.iloc[movie_index]['genres'],
-                    'director': self.df.iloc[movie_index]['director'],
-                    'similarity_score': float(similarity_score)
-                }
-                recommendations.append(recommendation)
-                
-                # İstenen sayıya ulaştıysak dur
-                if len(recommendations) >= num_recommendations:
-                    break
+            np.save(os.path.join(tmp_dir, 'idf.npy'), self.tfidf_vectorizer.idf_)
+            
+            # CSR dizileri ayrı .npy dosyalarına yazılır; böylece yüklemede bellek eşlenebilirler.
+            # İndeksler önceden sıralanır ki salt okunur matris hiçbir zaman yerinde değiştirilmesin
+            self.tfidf_matrix.sort_indices()
+            for name in ('data', 'indices', 'indptr'):
+                np.save(os.path.join(tmp_dir, f'tfidf_{name}.npy'), getattr(self.tfidf_matrix, name))
+            
+            # Sayısal sütunlar da .npy olarak, geri kalan sütunlar pickle olarak saklanır
+            numeric_columns = [
+                column for column in self.df.columns
+                if isinstance(self.df[column].dtype, np.dtype) and self.df[column].dtype.kind in 'biuf'
+            ]
+            for position, column in enumerate(numeric_columns):
+                np.save(os.path.join(tmp_dir, f'column_{position}.npy'), self.df[column].to_numpy())
+            self.df.drop(columns=numeric_columns).to_pickle(os.path.join(tmp_dir, 'movies.pkl'))
+            
+            if self.neighbor_indices is not None:
+                self._save_neighbor_graph(tmp_dir)
+            
+            if self.ann_index is not None:
+                self._save_ann_index(tmp_dir)
+            
+            # Meta dosyası en son yazılır; yükleme bu dosyanın varlığına bakar
+            meta = {
+                'format_version': self.MODEL_FORMAT_VERSION,
+                'model_key': self.model_key,
+                'catalog_hash': self._compute_catalog_hash(self.df),
+                'num_movies': len(self.df),
+                'num_features': int(self.tfidf_matrix.shape[1]),
+                'matrix_dtype': str(self.tfidf_matrix.dtype),
+                'columns': [str(column) for column in self.df.columns],
+                'numeric_columns': [str(column) for column in numeric_columns]
+            }
+            with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            
+            if os.path.isdir(model_dir):
+                shutil.rmtree(model_dir, ignore_errors=True)
+            os.replace(tmp_dir, model_dir)
+            print(f"💾 Model kaydedildi: {model_dir}")
+            
+        except OSError as e:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            print(f"⚠️  Model kaydedilemedi: {str(e)}")
+    
+    def load_model(self, model_dir: str):
+        """
+        save_model ile kaydedilmiş bir artefaktı yükleyip bellekteki kataloğun yerine koyar.
         
-        print(f"🎬 {len(recommendations)} film önerisi oluşturuldu")
-        return recommendations
+        add_movies/remove_movies sonrası kaydedilen artefaktlar bir CSV dosyasına karşılık gelmediği
+        için model anahtarı taşımaz; bu yüzden CSV'den türetilen anahtar yerine artefakttaki katalog
+        hash'i ve film sayısı doğrulanır.
+        
+        Args:
+            model_dir (str): save_model ile yazılmış artefakt dizini
+            
+        Raises:
+            ValueError: Artefakt yoksa, formatı desteklenmiyorsa veya katalog doğrulaması başarısızsa
+        """
+        if not self._load_model(model_dir, check_model_key=False):
+            raise ValueError(f"Model artefaktı yüklenemedi: {model_dir}")
+        
+        with open(os.path.join(model_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+            model_key = json.load(f).get('model_key')
+        
+        # CSV'den üretilmiş artefaktlarda türetilmiş indeksler yine bu dizine yazılır
+        self.model_key = model_key
+        self.model_dir = model_dir if model_key else None
+        
+        self._reset_drift_tracking()
+        self._rebuild_catalog_indexes()
+        self.invalidate_cache()
+        
+        if self._shard_settings is not None:
+            self._build_shards()
+        
+        print(f"📂 Model yüklendi: {len(self.df)} film, {self.tfidf_matrix.shape[1]} özellik")
     
-    def get_movie_info(self, movie_id: int) -> Dict[str, Any]:
+    @staticmethod
+    def _compute_catalog_hash(df: pd.DataFrame) -> str:
         """
-        Belirli bir filmin bilgilerini getirir.
+        Kataloğun film ID'leri ve özellik metinlerinden içerik hash'i üretir.
         
         Args:
-            movie_id (int): Film ID'si
+            df (pd.DataFrame): Katalog
             
         Returns:
-            Dict[str, Any]: Film bilgileri
+            str: SHA-256 hash'i
+        """
+        hasher = hashlib.sha256()
+        hasher.update(df['movie_id'].to_numpy().astype(np.int64).tobytes())
+        for text in df['features'].astype(str):
+            hasher.update(text.encode('utf-8'))
+            hasher.update(b'\0')
+        return hasher.hexdigest()
+    
+    def _load_model(self, model_dir: str, check_model_key: bool = True) -> bool:
         """
-        movie_row = self.df[self.df['movie_id'] == movie_id]
+        Daha önce kaydedilmiş model artefaktını yükler.
         
-        if movie_row.empty:
-            raise ValueError(f"Film ID {movie_id} bulunamadı")
+        Artefakt tamamen okunup doğrulanmadan mevcut model alanları değiştirilmez.
         
-        movie_info = {
-            'movie_id': int(movie_row.iloc[0]['movie_id']),
-            'title': movie_row.iloc[0]['title'],
-            'genres': movie_row.iloc[0]['genres'],
-            'director': movie_row.iloc[0]['director'],
-            'actors': movie_row.iloc[0]['actors'],
-            'plot_summary': movie_row.iloc[0]['plot_summary']
-        }
+        Args:
+            model_dir (str): Artefakt dizini
+            check_model_key (bool): True ise artefaktın model anahtarı bu örneğinkiyle (CSV'den
+                türetilen) eşleşmelidir; False ise bunun yerine katalog hash'i doğrulanır
+            
+        Returns:
+            bool: Yükleme başarılıysa True, artefakt yok ya da geçersizse False
+        """
+        meta_path = os.path.join(model_dir, 'meta.json')
+        if not os.path.exists(meta_path):
+            return False
         
-        return movie_info
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            
+            if meta.get('format_version') != self.MODEL_FORMAT_VERSION:
+                return False
+            if check_model_key and meta.get('model_key') != self.model_key:
+                return False
+            
+            with open(os.path.join(model_dir, 'vocabulary.json'), 'r', encoding='utf-8') as f:
+                vocabulary = json.load(f)
+            
+            # Vektörleştiriciyi yeniden eğitmeden sözlük ve idf ağırlıklarıyla kur
+            vectorizer = TfidfVectorizer(**self.VECTORIZER_PARAMS, dtype=self.matrix_dtype)
+            vectorizer.vocabulary_ = vocabulary
+            vectorizer.idf_ = np.load(os.path.join(model_dir, 'idf.npy'))
+            
+            # Bellek eşlemeli modda diziler diskten salt okunur eşlenir (kopyalanmaz)
+            mmap_mode = 'r' if self.mmap else None
+            
+            matrix_arrays = [
+                np.load(os.path.join(model_dir, f'tfidf_{name}.npy'), mmap_mode=mmap_mode)
+                for name in ('data', 'indices', 'indptr')
+            ]
+            tfidf_matrix = self._compact_matrix(sparse.csr_matrix(
+                tuple(matrix_arrays), shape=(meta['num_movies'], meta['num_features']), copy=False
+            ))
+            
+            df = pd.read_pickle(os.path.join(model_dir, 'movies.pkl'))
+            numeric_values = {
+                column: np.load(os.path.join(model_dir, f'column_{position}.npy'), mmap_mode=mmap_mode)
+                for position, column in enumerate(meta['numeric_columns'])
+            }
+            # DataFrame son sütun sırasıyla tek seferde kurulur: sütun ekleme ve sütun seçimi Copy-on-Write
+            # olmayan pandas sürümlerinde (< 3.0) sayısal dizileri kopyalar, copy=False ile kurulan çerçeve ise
+            # blokları birleştirmez ve bellek eşlemeli dizileri olduğu gibi kullanır
+            df = pd.DataFrame({
+                column: numeric_values[column] if column in numeric_values else df[column]
+                for column in meta['columns']
+            }, index=df.index, copy=False)
+            
+            if len(df) != meta['num_movies']:
+                print(f"⚠️  Kayıtlı model tutarsız: {len(df)} satır, meta {meta['num_movies']} film bekliyor")
+                return False
+            
+            if not check_model_key and meta.get('catalog_hash') != self._compute_catalog_hash(df):
+                print("⚠️  Kayıtlı modelin katalog hash'i eşleşmiyor")
+                return False
+            
+            # Komşu tablosu opsiyoneldir; daha önce oluşturulduysa birlikte yüklenir
+            neighbor_indices, neighbor_scores = None, None
+            neighbors_path = os.path.join(model_dir, 'neighbors.npz')
+            if os.path.exists(neighbors_path):
+                with np.load(neighbors_path) as neighbors:
+                    neighbor_indices = neighbors['indices']
+                    neighbor_scores = neighbors['scores']
+            
+            # Yaklaşık en yakın komşu (ANN) indeksi de opsiyoneldir
+            ann_index, ann_n_probe = None, self.ann_n_probe
+            ann_path = os.path.join(model_dir, 'ann_index.npz')
+            if os.path.exists(ann_path):
+                with np.load(ann_path) as ann_data:
+                    ann_index = {name: ann_data[name] for name in ('components', 'centroids', 'list_offsets', 'list_items')}
+                    ann_n_probe = int(ann_data['n_probe'])
+            
+            self.tfidf_vectorizer = vectorizer
+            self.tfidf_matrix = tfidf_matrix
+            self.df = df
+            self.neighbor_indices, self.neighbor_scores = neighbor_indices, neighbor_scores
+            self.ann_index, self.ann_n_probe = ann_index, ann_n_probe
+            return True
+            
+        except Exception as e:
+            print(f"⚠️  Kayıtlı model okunamadı, yeniden eğitilecek: {str(e)}")
+            return False
+    
+    def _rebuild_catalog_indexes(self):
+        """Katalog yüklendiğinde veya değiştiğinde yardımcı indeksleri yeniden kurar."""
+        # Film ID'si -> satır pozisyonu (her aramada tüm sütunu taramamak için).
+        # Aynı ID birden fazla kez geçerse ilk satır kullanılır.
+        self._id_to_index = {}
+        for position, movie_id in enumerate(self.df['movie_id'].tolist()):
+            self._id_to_index.setdefault(movie_id, position)
+        
+        # Sonuç sütunları diziler halinde tutulur; sonuçlar satır satır iloc yerine
+        # seçilen pozisyonlarla tek seferde indekslenerek kurulur
+        self._result_columns = {column: self.df[column].to_numpy(dtype=object) for column in self.RESULT_COLUMNS}
+        self._result_columns['movie_id'] = self.df['movie_id'].to_numpy().astype(np.int64)
+        
+        # Filtre indeksleri ilk kullanıldıklarında sütun sütun kurulur
+        self._filter_indexes = {}
+        
+        # Başlık arama indeksleri ilk (bulanık) aramada kurulur
+        self._title_index = None
+        self._title_word_index = None
     
-    def search_movies(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
+    def _lookup_movie_indices(self, movie_ids: List[int]) -> Tuple[List[int], List[int]]:
         """
-        Film başlığında arama yapar.
+        Film ID'lerini DataFrame satır pozisyonlarına çevirir.
         
         Args:
-            query (str): Arama terimi
-            max_results (int): Maksimum sonuç sayısı
+            movie_ids (List[int]): Film ID'leri
             
         Returns:
-            List[Dict[str, Any]]: Bulunan filmlerin listesi
+            Tuple[List[int], List[int]]: Bulunan satır pozisyonları ve bulunan film ID'leri
         """
-        if not query.strip():
-            raise ValueError("Arama terimi boş olamaz")
+        indices = []
+        found_movie_ids = []
         
-        # Başlıkta arama yap (büyük/küçük harf duyarsız)
-        matches = self.df[self.df['title'].str.contains(query, case=False, na=False)]
+        for movie_id in movie_ids:
+            index = self._id_to_index.get(movie_id)
+            if index is not None:
+                indices.append(index)
+                found_movie_ids.append(movie_id)
+            else:
+                print(f"⚠️  Film ID {movie_id} veri setinde bulunamadı")
         
-        results = []
-        for _, row in matches.head(max_results).iterrows():
-            result = {
-                'movie_id': int(row['movie_id']),
-                'title': row['title'],
-                'genres': row['genres'],
-                'director': row['director']
-            }
-            results.append(result)
+        return indices, found_movie_ids
+    
+    def build_neighbor_graph(self, num_neighbors: int = 50, batch_size: int = 256):
+        """
+        Her film için en benzer num_neighbors filmi önceden hesaplar (film-film komşu tablosu).
         
-        return results
+        Tablo, kompakt int32 indeks ve float32 skor dizileri olarak tutulur. Model önbelleği
+        kullanılıyorsa artefakt dizinine de kaydedilir ve sonraki açılışlarda hazır yüklenir.
+        Bir veya birkaç film ile başlatılan öneriler bu tablodan hızlıca cevaplanır.
+        
+        Args:
+            num_neighbors (int): Film başına saklanacak komşu sayısı (varsayılan: 50)
+            batch_size (int): Aynı anda hesaplanacak film sayısı; bellek kullanımı
+                yaklaşık batch_size x film sayısı kadar skordur
+        """
+        if num_neighbors <= 0:
+            raise ValueError("Komşu sayısı pozitif olmalıdır")
+        
+        num_movies = self.tfidf_matrix.shape[0]
+        num_neighbors = min(num_neighbors, max(num_movies - 1, 1))
+        
+        neighbor_indices = np.full((num_movies, num_neighbors), -1, dtype=np.int32)
+        neighbor_scores = np.zeros((num_movies, num_neighbors), dtype=np.float32)
+        
+        print(f"🕸️  Komşu tablosu oluşturuluyor: {num_movies} film x {num_neighbors} komşu")
+        
+        for start in range(0, num_movies, batch_size):
+            end = min(start + batch_size, num_movies)
+            
+            # Satırlar L2 normalize olduğu için iç çarpım kosinüs benzerliğidir
+            block_scores = np.asarray(self.tfidf_matrix @ self.tfidf_matrix[start:end].T.toarray()).T
+            block_scores[block_scores <= 0] = -np.inf
+            block_scores[np.arange(end - start), np.arange(start, end)] = -np.inf
+            
+            top_indices, top_scores = self._top_k_per_row(block_scores, num_neighbors)
+            valid = np.isfinite(top_scores)
+            neighbor_indices[start:end] = np.where(valid, top_indices, -1)
+            neighbor_scores[start:end] = np.where(valid, top_scores, 0)
+        
+        self.neighbor_indices = neighbor_indices
+        self.neighbor_scores = neighbor_scores
+        self.invalidate_cache()
+        
+        if self.model_dir and os.path.isdir(self.model_dir):
+            self._save_neighbor_graph(self.model_dir)
+        
+        print(f"✅ Komşu tablosu hazır ({(neighbor_indices.nbytes + neighbor_scores.nbytes) / 1024:.0f} KB)")
+    
+    def _save_neighbor_graph(self, model_dir: str):
+        """Komşu tablosunu artefakt dizinine yazar (geçici dosya + atomik taşıma)."""
+        tmp_path = os.path.join(model_dir, f'.neighbors_{os.getpid()}.npz')
+        np.savez(tmp_path, indices=self.neighbor_indices, scores=self.neighbor_scores)
+        os.replace(tmp_path, os.path.join(model_dir, 'neighbors.npz'))
+    
+    def _get_neighbor_candidates(self, watched_movie_indices: List[int]) -> Optional[np.ndarray]:
+        """
+        Az sayıda başlangıç filmi için komşu listelerini birleştirerek aday filmleri döndürür.
+        
+        Args:
+            watched_movie_indices (List[int]): İzlenen filmlerin satır pozisyonları
+            
+        Returns:
+            Optional[np.ndarray]: Sıralı aday pozisyonları; komşu tablosu yoksa veya profil
+                hızlı yol için fazla büyükse None (tam skorlama yapılmalı)
+        """
+        if self.neighbor_indices is None or len(watched_movie_indices) > self.NEIGHBOR_SEED_LIMIT:
+            return None
+        
+        candidates = self.neighbor_indices[watched_movie_indices].ravel()
+        candidates = candidates[candidates >= 0]
+        
+        return np.setdiff1d(candidates, watched_movie_indices)
+    
+    def build_ann_index(self, n_components: int = 128, n_clusters: Optional[int] = None,
+                        n_probe: int = 16, random_state: int = 42):
+        """
+        Çok büyük kataloglar için yaklaşık en yakın komşu (ANN) indeksi oluşturur.
+        
+        TF-IDF matrisi TruncatedSVD ile n_components boyutlu gömmelere indirgenir ve gömmeler
+        k-means ile kümelenir (kümelenmiş ters dosya / IVF). Sorgu anında profile en yakın
+        n_probe kümedeki filmler aday olarak alınır ve yalnızca bu adaylar tam TF-IDF
+        benzerliği ile skorlanır. n_probe büyüdükçe isabet (recall) artar, gecikme uzar.
+        
+        Args:
+            n_components (int): SVD gömme boyutu (varsayılan: 128)
+            n_clusters (Optional[int]): Küme sayısı (varsayılan: film sayısının karekökü)
+            n_probe (int): Sorgu başına taranacak küme sayısı (varsayılan: 16)
+            random_state (int): SVD ve k-means için rastgelelik tohumu
+        """
+        from sklearn.decomposition import TruncatedSVD
+        from sklearn.cluster import MiniBatchKMeans
+        
+        num_movies, num_features = self.tfidf_matrix.shape
+        n_components = max(1, min(n_components, num_features - 1, num_movies - 1))
+        n_clusters = n_clusters or int(np.sqrt(num_movies))
+        n_clusters = max(1, min(n_clusters, num_movies))
+        
+        print(f"🧭 ANN indeksi oluşturuluyor: {n_components} boyut, {n_clusters} küme")
+        
+        svd = TruncatedSVD(n_components=n_components, random_state=random_state)
+        embeddings = self._normalize_rows(svd.fit_transform(self.tfidf_matrix))
+        
+        kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state, n_init=3)
+        labels = kmeans.fit_predict(embeddings)
+        
+        # Ters listeler: küme c'deki filmler list_items[list_offsets[c]:list_offsets[c + 1]]
+        list_items = np.argsort(labels, kind='stable').astype(np.int32)
+        list_offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=n_clusters))]).astype(np.int64)
+        
+        self.ann_index = {
+            'components': svd.components_.astype(np.float32),
+            'centroids': self._normalize_rows(kmeans.cluster_centers_).astype(np.float32),
+            'list_offsets': list_offsets,
+            'list_items': list_items
+        }
+        self.ann_n_probe = n_probe
+        self.invalidate_cache()
+        
+        if self.model_dir and os.path.isdir(self.model_dir):
+            self._save_ann_index(self.model_dir)
+        
+        print(f"✅ ANN indeksi hazır (varsayılan n_probe={n_probe})")
+    
+    @staticmethod
+    def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        """Yoğun bir matrisin satırlarını L2 normuna böler (sıfır satırlar olduğu gibi kalır)."""
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+    
+    def _save_ann_index(self, model_dir: str):
+        """ANN indeksini artefakt dizinine yazar (geçici dosya + atomik taşıma)."""
+        tmp_path = os.path.join(model_dir, f'.ann_index_{os.getpid()}.npz')
+        np.savez(tmp_path, n_probe=self.ann_n_probe, **self.ann_index)
+        os.replace(tmp_path, os.path.join(model_dir, 'ann_index.npz'))
+    
+    def _get_ann_candidates(self, user_profile_vector: sparse.csr_matrix,
+                            watched_movie_indices: List[int]) -> Optional[np.ndarray]:
+        """
+        Profile en yakın n_probe kümedeki filmleri aday olarak döndürür.
+        
+        Args:
+            user_profile_vector (sparse.csr_matrix): 1 x özellik profil vektörü
+            watched_movie_indices (List[int]): Adaylardan çıkarılacak satır pozisyonları
+            
+        Returns:
+            Optional[np.ndarray]: Sıralı aday pozisyonları; ANN indeksi yoksa None
+        """
+        if self.ann_index is None:
+            return None
+        
+        # Seyrek profil x (özellik x boyut) projeksiyon: maliyet profildeki terim sayısıyla orantılı
+        embedding = np.asarray(user_profile_vector @ self.ann_index['components'].T).ravel()
+        centroid_scores = self.ann_index['centroids'] @ embedding
+        
+        n_probe = max(1, min(self.ann_n_probe, len(centroid_scores)))
+        probed_clusters = np.argpartition(-centroid_scores, n_probe - 1)[:n_probe]
+        
+        offsets = self.ann_index['list_offsets']
+        candidates = np.concatenate([
+            self.ann_index['list_items'][offsets[cluster]:offsets[cluster + 1]]
+            for cluster in probed_clusters
+        ])
+        
+        return np.setdiff1d(candidates, watched_movie_indices)
+    
+    def add_movies(self, rows: Union[pd.DataFrame, List[Dict[str, Any]]]) -> int:
+        """
+        Kataloğa TF-IDF modelini yeniden eğitmeden yeni filmler ekler.
+        
+        Yeni filmler mevcut (dondurulmuş) sözlük ve idf ağırlıklarıyla vektörleştirilip matrisin
+        sonuna eklenir; komşu tablosu ve ANN indeksi varsa yerinde güncellenir. Eklenen filmlerdeki
+        sözlük dışı terim oranı eğitim korpusuna göre VOCABULARY_DRIFT_THRESHOLD'dan fazla artarsa
+        tam yeniden eğitim planlanır ve bir sonraki öneri isteğinden önce yapılır.
+        
+        Args:
+            rows (Union[pd.DataFrame, List[Dict[str, Any]]]): Eklenecek filmler (CSV ile aynı sütunlar)
+            
+        Returns:
+            int: Eklenen film sayısı
+        """
+        new_df = rows.copy() if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows)
+        if new_df.empty:
+            return 0
+        
+        new_df = self._prepare_dataframe(new_df.reset_index(drop=True))
+        
+        new_ids = new_df['movie_id'].tolist()
+        existing_ids = [movie_id for movie_id in new_ids if movie_id in self._id_to_index]
+        if existing_ids or len(set(new_ids)) != len(new_ids):
+            raise ValueError(f"Film ID'leri zaten katalogda veya tekrarlı: {existing_ids or new_ids}")
+        
+        # Dondurulmuş sözlük ve idf ile vektörleştir
+        new_matrix = self.tfidf_vectorizer.transform(new_df['features'])
+        self._track_vocabulary_drift(new_df['features'])
+        
+        start = len(self.df)
+        self.df = pd.concat([self.df, new_df], ignore_index=True)
+        self.tfidf_matrix = sparse.vstack([self.tfidf_matrix, new_matrix], format='csr')
+        
+        self._extend_neighbor_graph(start)
+        self._extend_ann_index(start)
+        self._on_catalog_changed()
+        
+        print(f"➕ {len(new_df)} film kataloğa eklendi (toplam: {len(self.df)})")
+        return len(new_df)
+    
+    def remove_movies(self, movie_ids: List[int]) -> int:
+        """
+        Verilen filmleri katalogdan çıkarır (yeniden eğitim yapılmaz).
+        
+        Args:
+            movie_ids (List[int]): Çıkarılacak film ID'leri
+            
+        Returns:
+            int: Çıkarılan film sayısı
+        """
+        indices, _ = self._lookup_movie_indices(movie_ids)
+        if not indices:
+            return 0
+        
+        keep = np.ones(len(self.df), dtype=bool)
+        keep[indices] = False
+        
+        # Eski pozisyon -> yeni pozisyon (çıkarılanlar için -1)
+        new_positions = np.cumsum(keep) - 1
+        new_positions[~keep] = -1
+        
+        self.df = self.df[keep].reset_index(drop=True)
+        self.tfidf_matrix = self.tfidf_matrix[np.flatnonzero(keep)]
+        
+        self._remap_neighbor_graph(keep, new_positions)
+        self._remap_ann_index(keep, new_positions)
+        self._on_catalog_changed()
+        
+        removed_count = int((~keep).sum())
+        print(f"➖ {removed_count} film katalogdan çıkarıldı (toplam: {len(self.df)})")
+        return removed_count
+    
+    def refit(self):
+        """
+        TF-IDF modelini güncel katalog üzerinde yeniden eğitir.
+        
+        Daha önce oluşturulmuş komşu tablosu ve ANN indeksi aynı ayarlarla yeniden kurulur.
+        """
+        print("🔁 TF-IDF modeli güncel katalog üzerinde yeniden eğitiliyor...")
+        
+        num_neighbors = self.neighbor_indices.shape[1] if self.neighbor_indices is not None else None
+        ann_settings = None
+        if self.ann_index is not None:
+            ann_settings = {
+                'n_components': self.ann_index['components'].shape[0],
+                'n_clusters': self.ann_index['centroids'].shape[0],
+                'n_probe': self.ann_n_probe
+            }
+        
+        self.neighbor_indices = None
+        self.neighbor_scores = None
+        self.ann_index = None
+        
+        self._fit_model()
+        self._on_catalog_changed()
+        
+        if num_neighbors:
+            self.build_neighbor_graph(num_neighbors)
+        if ann_settings:
+            self.build_ann_index(**ann_settings)
+        
+        print(f"✅ Yeniden eğitim tamamlandı: {len(self.df)} film, {self.tfidf_matrix.shape[1]} özellik")
+    
+    def _apply_pending_refit(self):
+        """Sözlük kayması nedeniyle planlanmış bir yeniden eğitim varsa şimdi uygular."""
+        if self._refit_pending:
+            self.refit()
+    
+    def _on_catalog_changed(self):
+        """Katalog yerinde değiştiğinde çağrılır."""
+        self.tfidf_matrix = self._compact_matrix(self.tfidf_matrix)
+        
+        # Bellekteki katalog artık CSV'den üretilen artefakta karşılık gelmiyor;
+        # türetilmiş indeksler bu dizine yazılmamalı
+        self.model_key = None
+        self.model_dir = None
+        
+        self._rebuild_catalog_indexes()
+        self.invalidate_cache()
+        
+        # Katalog bölümleri yeni matrise göre yeniden kurulur
+        if self._shard_settings is not None:
+            self._build_shards()
+    
+    def _reset_drift_tracking(self):
+        """Sözlük kayması sayaçlarını sıfırlar (model her eğitildiğinde)."""
+        self._refit_pending = False
+        self._drift_total_terms = 0
+        self._drift_unknown_terms = 0
+        self._baseline_unknown_rate = None
+    
+    def _count_unknown_terms(self, texts: pd.Series) -> Tuple[int, int]:
+        """Metinlerdeki sözlük dışı terim sayısını ve toplam terim sayısını döndürür."""
+        analyzer = self.tfidf_vectorizer.build_analyzer()
+        vocabulary = self.tfidf_vectorizer.vocabulary_
+        
+        unknown_terms = 0
+        total_terms = 0
+        for text in texts:
+            terms = analyzer(text)
+            total_terms += len(terms)
+            unknown_terms += sum(1 for term in terms if term not in vocabulary)
+        
+        return unknown_terms, total_terms
+    
+    def _track_vocabulary_drift(self, texts: pd.Series):
+        """
+        Yeni filmlerin sözlük dışı terim oranını eğitim korpusuyla karşılaştırır ve eşik aşılırsa
+        yeniden eğitim planlar.
+        
+        max_features sınırı nedeniyle eğitim korpusunda da sözlük dışı terimler vardır; bu yüzden
+        karşılaştırma, korpustan alınan bir örneklemin oranına göre yapılır.
+        """
+        if self._baseline_unknown_rate is None:
+            sample = self.df['features'].sample(n=min(1000, len(self.df)), random_state=0)
+            unknown_terms, total_terms = self._count_unknown_terms(sample)
+            self._baseline_unknown_rate = unknown_terms / max(total_terms, 1)
+        
+        unknown_terms, total_terms = self._count_unknown_terms(texts)
+        self._drift_unknown_terms += unknown_terms
+        self._drift_total_terms += total_terms
+        
+        drift = self._drift_unknown_terms / max(self._drift_total_terms, 1) - self._baseline_unknown_rate
+        if drift > self.VOCABULARY_DRIFT_THRESHOLD and not self._refit_pending:
+            self._refit_pending = True
+            print(f"🔁 Sözlük kayması %{drift * 100:.1f}: bir sonraki öneride model yeniden eğitilecek")
+    
+    def _extend_neighbor_graph(self, start: int, batch_size: int = 256):
+        """
+        Kataloğun sonuna eklenen filmleri (start ve sonrası) komşu tablosuna işler.
+        
+        Yeni filmlerin komşu listeleri tüm katalog üzerinden kesin olarak hesaplanır; mevcut
+        filmlerin listeleri yalnızca yeni filmlerle birleştirilerek güncellenir.
+        """
+        if self.neighbor_indices is None:
+            return
+        
+        num_movies = self.tfidf_matrix.shape[0]
+        num_neighbors = self.neighbor_indices.shape[1]
+        
+        self.neighbor_indices = np.vstack([
+            self.neighbor_indices, np.full((num_movies - start, num_neighbors), -1, dtype=np.int32)
+        ])
+        self.neighbor_scores = np.vstack([
+            self.neighbor_scores, np.zeros((num_movies - start, num_neighbors), dtype=np.float32)
+        ])
+        
+        for block_start in range(start, num_movies, batch_size):
+            block_end = min(block_start + batch_size, num_movies)
+            
+            block_scores = np.asarray(self.tfidf_matrix @ self.tfidf_matrix[block_start:block_end].T.toarray()).T
+            block_scores[block_scores <= 0] = -np.inf
+            block_scores[np.arange(block_end - block_start), np.arange(block_start, block_end)] = -np.inf
+            
+            # Yeni filmlerin kendi komşu listeleri
+            top_indices, top_scores = self._top_k_per_row(block_scores, num_neighbors)
+            valid = np.isfinite(top_scores)
+            self.neighbor_indices[block_start:block_end] = np.where(valid, top_indices, -1)
+            self.neighbor_scores[block_start:block_end] = np.where(valid, top_scores, 0)
+            
+            # Mevcut filmlerin listelerini yeni filmlerle birleştir
+            existing_indices = self.neighbor_indices[:start]
+            existing_scores = np.where(existing_indices >= 0, self.neighbor_scores[:start], -np.inf)
+            block_columns = np.broadcast_to(
+                np.arange(block_start, block_end, dtype=np.int32), (start, block_end - block_start)
+            )
+            
+            combined_indices = np.hstack([existing_indices, block_columns])
+            combined_scores = np.hstack([existing_scores, block_scores[:, :start].T])
+            
+            top_positions, top_scores = self._top_k_per_row(combined_scores, num_neighbors)
+            valid = np.isfinite(top_scores)
+            self.neighbor_indices[:start] = np.where(valid, np.take_along_axis(combined_indices, top_positions, axis=1), -1)
+            self.neighbor_scores[:start] = np.where(valid, top_scores, 0)
+    
+    def _remap_neighbor_graph(self, keep: np.ndarray, new_positions: np.ndarray):
+        """Film çıkarıldıktan sonra komşu tablosunu yeni satır pozisyonlarına taşır."""
+        if self.neighbor_indices is None:
+            return
+        
+        neighbor_indices = self.neighbor_indices[keep]
+        neighbor_scores = self.neighbor_scores[keep]
+        
+        remapped = np.where(neighbor_indices >= 0, new_positions[np.maximum(neighbor_indices, 0)], -1)
+        
+        # Çıkarılan komşuları liste sonuna kaydır (kalanların sırası korunur)
+        order = np.argsort(remapped < 0, axis=1, kind='stable')
+        remapped = np.take_along_axis(remapped, order, axis=1)
+        neighbor_scores = np.take_along_axis(neighbor_scores, order, axis=1)
+        
+        self.neighbor_indices = remapped.astype(np.int32)
+        self.neighbor_scores = np.where(remapped >= 0, neighbor_scores, 0).astype(np.float32)
+    
+    def _extend_ann_index(self, start: int):
+        """Kataloğun sonuna eklenen filmleri en yakın ANN kümelerine yerleştirir."""
+        if self.ann_index is None:
+            return
+        
+        new_matrix = self.tfidf_matrix[start:]
+        embeddings = self._normalize_rows(np.asarray(new_matrix @ self.ann_index['components'].T))
+        new_labels = np.argmax(embeddings @ self.ann_index['centroids'].T, axis=1)
+        
+        labels = np.concatenate([self._get_ann_labels(), new_labels])
+        items = np.concatenate([self.ann_index['list_items'], np.arange(start, self.tfidf_matrix.shape[0])])
+        self._set_ann_lists(items, labels)
+    
+    def _remap_ann_index(self, keep: np.ndarray, new_positions: np.ndarray):
+        """Film çıkarıldıktan sonra ANN ters listelerini yeni satır pozisyonlarına taşır."""
+        if self.ann_index is None:
+            return
+        
+        items = new_positions[self.ann_index['list_items']]
+        labels = self._get_ann_labels()
+        self._set_ann_lists(items[items >= 0], labels[items >= 0])
+    
+    def _get_ann_labels(self) -> np.ndarray:
+        """ANN ters listelerindeki her öğenin küme numarası (list_items ile aynı sırada)."""
+        list_offsets = self.ann_index['list_offsets']
+        return np.repeat(np.arange(len(list_offsets) - 1), np.diff(list_offsets))
+    
+    def _set_ann_lists(self, items: np.ndarray, labels: np.ndarray):
+        """Öğe ve küme numaralarından ANN ters listelerini yeniden kurar."""
+        num_clusters = len(self.ann_index['list_offsets']) - 1
+        order = np.argsort(labels, kind='stable')
+        
+        self.ann_index['list_items'] = items[order].astype(np.int32)
+        self.ann_index['list_offsets'] = np.concatenate(
+            [[0], np.cumsum(np.bincount(labels, minlength=num_clusters))]
+        ).astype(np.int64)
+    
+    def enable_sharding(self, num_shards: Optional[int] = None, use_processes: bool = False):
+        """
+        Tam katalog skorlamasını satır bölümlerine ayırıp paralel çalıştırır.
+        
+        Her bölüm kendi en iyi k filmini döndürür, sonuçlar ana süreçte birleştirilir. İş parçacığı
+        modunda bölümler ana matrisin kopyasız görünümleridir (seyrek matris-vektör çarpımı GIL'i
+        bırakır); süreç modunda her bölüm tek işçili ayrı bir süreç havuzunda bir kez tutulur.
+        Komşu tablosu ve ANN aday yolları bu ayardan etkilenmez.
+        
+        Args:
+            num_shards (Optional[int]): Bölüm sayısı (varsayılan: CPU çekirdeği sayısı)
+            use_processes (bool): True ise süreç havuzu, False ise iş parçacığı havuzu kullanılır
+        """
+        if num_shards is not None and num_shards <= 0:
+            raise ValueError("Bölüm sayısı pozitif olmalıdır")
+        
+        self._shard_settings = {
+            'num_shards': num_shards or os.cpu_count() or 1,
+            'use_processes': use_processes
+        }
+        self._build_shards()
+        
+        mode = 'süreç' if use_processes else 'iş parçacığı'
+        print(f"🧩 Bölümlü skorlama etkin: {len(self._shards)} bölüm ({mode})")
+    
+    def disable_sharding(self):
+        """Bölümlü skorlamayı kapatır ve işçi havuzlarını sonlandırır."""
+        self._shutdown_shard_executors()
+        self._shard_settings = None
+        self._shards = []
+    
+    def _shutdown_shard_executors(self):
+        """Açık işçi havuzlarını kapatır."""
+        for executor in self._shard_executors:
+            executor.shutdown()
+        self._shard_executors = []
+    
+    def _build_shards(self):
+        """Matrisi, kayıt (nnz) sayısı dengeli ardışık satır bölümlerine ayırır ve işçileri başlatır."""
+        self._shutdown_shard_executors()
+        
+        num_movies = self.tfidf_matrix.shape[0]
+        num_shards = max(1, min(self._shard_settings['num_shards'], num_movies))
+        
+        # Bölüm sınırları, her bölümde yaklaşık eşit sayıda sıfır olmayan değer olacak şekilde seçilir
+        targets = np.linspace(0, self.tfidf_matrix.nnz, num_shards + 1)
+        bounds = np.unique(np.concatenate([[0], np.searchsorted(self.tfidf_matrix.indptr, targets[1:-1]), [num_movies]]))
+        
+        self._shards = [
+            (int(start), int(end), self._row_slice(int(start), int(end)))
+            for start, end in zip(bounds[:-1], bounds[1:])
+        ]
+        
+        if self._shard_settings['use_processes']:
+            self._shard_executors = [
+                ProcessPoolExecutor(max_workers=1, initializer=_init_shard_worker, initargs=(shard_matrix,))
+                for _, _, shard_matrix in self._shards
+            ]
+        else:
+            self._shard_executors = [ThreadPoolExecutor(max_workers=len(self._shards))]
+    
+    def _row_slice(self, start: int, end: int) -> sparse.csr_matrix:
+        """Ardışık satırlar için veri dizilerini kopyalamadan bir CSR görünümü oluşturur."""
+        matrix = self.tfidf_matrix
+        data_start, data_end = matrix.indptr[start], matrix.indptr[end]
+        
+        return sparse.csr_matrix(
+            (matrix.data[data_start:data_end], matrix.indices[data_start:data_end],
+             matrix.indptr[start:end + 1] - data_start),
+            shape=(end - start, matrix.shape[1]), copy=False
+        )
+    
+    def _score_sharded(self, user_profile_vector: sparse.csr_matrix, k: int,
+                       exclude_indices: Optional[List[int]] = None,
+                       allowed_mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Profili tüm bölümlerde paralel skorlar ve bölümlerin yerel en iyi k listelerini birleştirir.
+        
+        Args:
+            user_profile_vector (sparse.csr_matrix): 1 x özellik profil vektörü
+            k (int): Seçilecek film sayısı
+            exclude_indices (Optional[List[int]]): Sonuçlardan çıkarılacak satır pozisyonları
+            allowed_mask (Optional[np.ndarray]): Verilirse yalnızca True olan satırlar seçilebilir
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Skora göre azalan sırada satır pozisyonları ve skorları
+        """
+        profile_values = user_profile_vector.toarray().ravel().astype(self.tfidf_matrix.dtype, copy=False)
+        profile_norm = np.linalg.norm(profile_values)
+        if profile_norm == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        
+        exclude_indices = np.asarray(exclude_indices if exclude_indices is not None else [], dtype=np.int64)
+        
+        futures = []
+        for shard_number, (start, end, shard_matrix) in enumerate(self._shards):
+            local_exclude = exclude_indices[(exclude_indices >= start) & (exclude_indices < end)] - start
+            local_mask = allowed_mask[start:end] if allowed_mask is not None else None
+            
+            if self._shard_settings['use_processes']:
+                futures.append(self._shard_executors[shard_number].submit(
+                    _score_worker_shard, profile_values, profile_norm, local_exclude, k, local_mask
+                ))
+            else:
+                futures.append(self._shard_executors[0].submit(
+                    _score_shard, shard_matrix, profile_values, profile_norm, local_exclude, k, local_mask
+                ))
+        
+        # Bölümler artan satır sırasında birleştirildiği için eşit skorlarda küçük pozisyon önce kalır
+        candidate_indices, candidate_scores = [], []
+        for (start, _, _), future in zip(self._shards, futures):
+            local_indices, local_scores = future.result()
+            candidate_indices.append(local_indices + start)
+            candidate_scores.append(local_scores)
+        
+        candidate_indices = np.concatenate(candidate_indices)
+        candidate_scores = np.concatenate(candidate_scores)
+        order = self._select_top_k(candidate_scores, k)
+        
+        return candidate_indices[order], candidate_scores[order]
+    
+    def _get_user_profile(self, watched_movie_indices: List[int]) -> sparse.csr_matrix:
+        """
+        Kullanıcının izlediği filmlere dayanarak kullanıcı profil vektörü oluşturur.
+        
+        Profil, ağırlık vektörü ile izlenen filmlerin seyrek TF-IDF satırlarının çarpımıyla
+        hesaplanır; yoğun bir (izlenen film x özellik) dizisi hiç oluşturulmaz.
+        
+        Args:
+            watched_movie_indices (List[int]): İzlenen filmlerin DataFrame indeksleri
+            
+        Returns:
+            sparse.csr_matrix: Kullanıcının zevk profilini temsil eden 1 x özellik seyrek vektör
+        """
+        if not watched_movie_indices:
+            raise ValueError("İzlenen film listesi boş olamaz")
+        
+        # İzlenen filmlerin TF-IDF vektörlerini al
+        watched_vectors = self.tfidf_matrix[watched_movie_indices]
+        
+        # Vektörlerin ortalamasını al (kullanıcı profili)
+        weights = self._get_movie_weights(watched_movie_indices)
+        weights = weights / weights.sum()
+        user_profile_vector = sparse.csr_matrix(weights.reshape(1, -1), dtype=self.tfidf_matrix.dtype) @ watched_vectors
+        
+        return sparse.csr_matrix(user_profile_vector)
+    
+    def _get_movie_weights(self, movie_indices: List[int]) -> np.ndarray:
+        """Profil ortalamasında kullanılacak film ağırlıkları (tüm filmler eşit ağırlıklı)"""
+        return np.ones(len(movie_indices))
+    
+    def _score_profile(self, user_profile_vector: sparse.csr_matrix,
+                       movie_indices: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Seyrek profil vektörünün tüm filmlerle kosinüs benzerliğini hesaplar.
+        
+        TF-IDF satırları L2 normalize edildiği için kosinüs benzerliği, katalog matrisi ile
+        profilin çarpımının profil normuna bölünmesiyle elde edilir. Profil yalnızca özellik
+        uzunluğunda bir vektöre açılır; seyrek x seyrek çarpıma göre belirgin şekilde hızlıdır.
+        
+        Args:
+            user_profile_vector (sparse.csr_matrix): 1 x özellik profil vektörü
+            movie_indices (Optional[np.ndarray]): Yalnızca bu satırları skorla (varsayılan: tüm katalog)
+            
+        Returns:
+            np.ndarray: Her film (veya verilen her satır) için benzerlik skoru
+        """
+        movie_matrix = self.tfidf_matrix if movie_indices is None else self.tfidf_matrix[movie_indices]
+        
+        # Profil matrisle aynı tipte olmalı; aksi halde çarpımda tüm matris kopyalanıp yükseltilir
+        profile_values = user_profile_vector.toarray().ravel().astype(self.tfidf_matrix.dtype, copy=False)
+        profile_norm = np.linalg.norm(profile_values)
+        if profile_norm == 0:
+            return np.zeros(movie_matrix.shape[0])
+        
+        similarity_scores = movie_matrix @ profile_values
+        return similarity_scores / profile_norm
+    
+    @staticmethod
+    def _select_top_k(scores: np.ndarray, k: int, exclude_indices: Optional[List[int]] = None,
+                      allowed_mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Skor vektöründen en yüksek skorlu k pozisyonu seçer.
+        
+        Tüm skorları sıralamak yerine argpartition ile k aday ayrılır, yalnızca bu k
+        aday sıralanır. Hariç tutulan pozisyonlar, filtreye uymayan filmler ve skoru 0 olan
+        filmler önceden maskelenir.
+        
+        Args:
+            scores (np.ndarray): Her film için benzerlik skoru
+            k (int): Seçilecek film sayısı
+            exclude_indices (Optional[List[int]]): Sonuçlardan çıkarılacak satır pozisyonları
+            allowed_mask (Optional[np.ndarray]): Verilirse yalnızca True olan pozisyonlar seçilebilir
+            
+        Returns:
+            np.ndarray: Skora göre azalan sırada satır pozisyonları (eşit skorlarda küçük pozisyon önce)
+        """
+        masked_scores = np.where(scores > 0, scores, -np.inf)
+        if exclude_indices is not None and len(exclude_indices) > 0:
+            masked_scores[exclude_indices] = -np.inf
+        if allowed_mask is not None:
+            masked_scores[~allowed_mask] = -np.inf
+        
+        k = min(k, int(np.count_nonzero(np.isfinite(masked_scores))))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        
+        if k < len(masked_scores):
+            top_indices = np.argpartition(-masked_scores, k - 1)[:k]
+        else:
+            top_indices = np.arange(len(masked_scores))
+        
+        order = np.lexsort((top_indices, -masked_scores[top_indices]))
+        return top_indices[order]
+    
+    def create_user_profile(self, movie_ids: Optional[List[int]] = None) -> UserProfile:
+        """
+        Bu öneri sistemine bağlı, artımlı güncellenen bir kullanıcı profili oluşturur.
+        
+        Args:
+            movie_ids (Optional[List[int]]): Başlangıçta profile eklenecek film ID'leri
+            
+        Returns:
+            UserProfile: Kullanıcı profili
+        """
+        return UserProfile(self, movie_ids)
+    
+    def get_recommendations(self, watched_movie_ids: Union[List[int], UserProfile], num_recommendations: int = 10,
+                            result_format: str = 'dict',
+                            filters: Optional[Dict[str, Any]] = None) -> Union[List[Dict[str, Any]], List[Recommendation], pd.DataFrame]:
+        """
+        Kullanıcının izlediği filmlere dayanarak film önerileri üretir.
+        
+        Args:
+            watched_movie_ids (Union[List[int], UserProfile]): Kullanıcının izlediği filmlerin ID'leri
+                veya artımlı güncellenen kullanıcı profili (profil yeniden hesaplanmaz)
+            num_recommendations (int): Önerilecek film sayısı (varsayılan: 10)
+            result_format (str): 'dict' (sözlük listesi), 'record' (Recommendation listesi)
+                veya 'dataframe' (varsayılan: 'dict')
+            filters (Optional[Dict[str, Any]]): Meta veri filtreleri, ör. {'genres': ['Drama', 'Crime']}.
+                Farklı filtreler VE, bir kategori filtresindeki değerler VEYA ile birleşir
+            
+        Returns:
+            Union[List[Dict[str, Any]], List[Recommendation], pd.DataFrame]: Önerilen filmler
+        """
+        user_profile, watched_movie_ids = self._unpack_watched_movies(watched_movie_ids)
+        
+        if num_recommendations <= 0:
+            raise ValueError("Öneri sayısı pozitif olmalıdır")
+        
+        self._check_result_format(result_format)
+        filter_key = self._normalize_filters(filters)
+        
+        self._apply_pending_refit()
+        
+        # Aynı izleme listesi ve parametrelerle daha önce üretilmiş sonuç varsa onu döndür
+        cache_key = self._recommendation_cache_key(watched_movie_ids, num_recommendations, result_format, filter_key)
+        cached_recommendations = self._get_cached_recommendations(cache_key)
+        if cached_recommendations is not None:
+            print(f"⚡ {len(cached_recommendations)} öneri önbellekten getirildi")
+            return cached_recommendations
+        
+        # İzlenen film ID'lerinin DataFrame'deki indekslerini bul
+        watched_movie_indices, found_movies = self._lookup_movie_indices(watched_movie_ids)
+        
+        if not watched_movie_indices:
+            raise ValueError("Hiçbir izlenen film veri setinde bulunamadı")
+        
+        print(f"📊 Profil oluşturuluyor: {len(found_movies)} film kullanılıyor")
+        
+        # Kullanıcı profil vektörünü hesapla (artımlı profil verildiyse hazır toplamlardan)
+        if user_profile is not None:
+            user_profile_vector = user_profile.to_vector()
+        else:
+            user_profile_vector = self._get_user_profile(watched_movie_indices)
+        
+        # Filtreler, skorlar sıralanmadan önce uygulanan bir maskeye çevrilir
+        filter_mask = self._build_filter_mask(filter_key)
+        
+        # Az sayıda başlangıç filmi varsa yalnızca komşu tablosundaki adayları,
+        # ANN indeksi varsa profile en yakın kümelerdeki adayları skorla
+        top_indices = None
+        candidate_indices = self._get_neighbor_candidates(watched_movie_indices)
+        if candidate_indices is None:
+            candidate_indices = self._get_ann_candidates(user_profile_vector, watched_movie_indices)
+        
+        if candidate_indices is not None:
+            if filter_mask is not None:
+                candidate_indices = candidate_indices[filter_mask[candidate_indices]]
+            candidate_scores = self._score_profile(user_profile_vector, candidate_indices)
+            candidate_order = self._select_top_k(candidate_scores, num_recommendations)
+            
+            # Yeterli aday yoksa tam skorlamaya geç
+            if len(candidate_order) >= num_recommendations:
+                top_indices = candidate_indices[candidate_order]
+                top_scores = candidate_scores[candidate_order]
+        
+        if top_indices is None and self._shards:
+            # Bölümlü skorlama: her bölüm yerel en iyi k filmi döndürür
+            top_indices, top_scores = self._score_sharded(
+                user_profile_vector, num_recommendations, watched_movie_indices, filter_mask
+            )
+        
+        if top_indices is None:
+            # Tüm filmlerle benzerlik skorlarını hesapla
+            similarity_scores = self._score_profile(user_profile_vector)
+            
+            # İzlenen filmleri maskeleyip en yüksek skorlu k filmi seç
+            top_indices = self._select_top_k(similarity_scores, num_recommendations, watched_movie_indices, filter_mask)
+            top_scores = similarity_scores[top_indices]
+        
+        recommendations = self._build_recommendations(top_indices, top_scores, result_format)
+        self._store_cached_recommendations(cache_key, recommendations)
+        
+        print(f"🎬 {len(recommendations)} film önerisi oluşturuldu")
+        return recommendations
+    
+    def recommend_by_text(self, query: str, num_recommendations: int = 10,
+                          filters: Optional[Dict[str, Any]] = None,
+                          result_format: str = 'dict') -> Union[List[Dict[str, Any]], List[Recommendation], pd.DataFrame]:
+        """
+        Serbest metne (ör. "heist thriller in space") en yakın filmleri önerir.
+        
+        Metin, eğitilmiş TF-IDF vektörleyicisiyle filmlerin özellik uzayına dönüştürülür ve
+        izleme listesi profilleriyle aynı seyrek skorlama ve top-k seçimiyle katalogla
+        karşılaştırılır; ayrı bir indeks gerekmez. Sözlükte olmayan kelimeler yok sayılır.
+        
+        Args:
+            query (str): Arama metni (konu, tür, anahtar kelimeler, oyuncu/yönetmen adları)
+            num_recommendations (int): Önerilecek film sayısı (varsayılan: 10)
+            filters (Optional[Dict[str, Any]]): Meta veri filtreleri, ör. {'genres': ['Sci-Fi']}
+                (bkz. get_recommendations)
+            result_format (str): 'dict', 'record' veya 'dataframe' (varsayılan: 'dict')
+            
+        Returns:
+            Union[List[Dict[str, Any]], List[Recommendation], pd.DataFrame]: Önerilen filmler
+                (metin sözlükle hiç örtüşmüyorsa boş)
+        """
+        if not query.strip():
+            raise ValueError("Arama metni boş olamaz")
+        
+        if num_recommendations <= 0:
+            raise ValueError("Öneri sayısı pozitif olmalıdır")
+        
+        self._check_result_format(result_format)
+        filter_key = self._normalize_filters(filters)
+        
+        self._apply_pending_refit()
+        
+        # Metin, filmlerle aynı TF-IDF uzayında 1 x özellik seyrek bir profil olur
+        query_vector = self.tfidf_vectorizer.transform([query])
+        if query_vector.nnz == 0:
+            print("⚠️  Metindeki kelimelerin hiçbiri modelin sözlüğünde yok")
+            return self._build_recommendations(np.empty(0, dtype=np.int64), np.empty(0), result_format)
+        
+        filter_mask = self._build_filter_mask(filter_key)
+        
+        if self._shards:
+            top_indices, top_scores = self._score_sharded(query_vector, num_recommendations, None, filter_mask)
+        else:
+            similarity_scores = self._score_profile(query_vector)
+            top_indices = self._select_top_k(similarity_scores, num_recommendations, None, filter_mask)
+            top_scores = similarity_scores[top_indices]
+        
+        recommendations = self._build_recommendations(top_indices, top_scores, result_format)
+        print(f"🔎 Metin araması: {len(recommendations)} film önerisi oluşturuldu")
+        return recommendations
+    
+    def _unpack_watched_movies(self, watched_movie_ids: Union[List[int], UserProfile]) -> Tuple[Optional[UserProfile], List[int]]:
+        """İzleme listesi yerine profil verildiyse profili ve film ID'lerini ayırır; boş listeyi reddeder."""
+        user_profile = None
+        if isinstance(watched_movie_ids, UserProfile):
+            if watched_movie_ids.recommender is not self:
+                raise ValueError("Kullanıcı profili başka bir öneri sistemine ait")
+            user_profile = watched_movie_ids
+            watched_movie_ids = user_profile.movie_ids
+        
+        if not watched_movie_ids:
+            raise ValueError("İzlenen film ID listesi boş olamaz")
+        
+        return user_profile, watched_movie_ids
+    
+    def create_recommendation_cursor(self, watched_movie_ids: Union[List[int], UserProfile],
+                                     exclude_movie_ids: Optional[List[int]] = None,
+                                     result_format: str = 'dict',
+                                     filters: Optional[Dict[str, Any]] = None) -> RecommendationCursor:
+        """
+        İzleme listesi için katalogu bir kez skorlar ve sayfalanabilir bir öneri imleci döndürür.
+        
+        Kullanıcı "daha fazla öneri" istedikçe büyük bir listeyi baştan üretmek yerine imlecin
+        next_page metodu kullanılır; her sayfa yalnızca sayfa boyutu kadar iş yapar ve sayfalar
+        tüm aday listesi boyunca ilerleyebilir.
+        
+        Args:
+            watched_movie_ids (Union[List[int], UserProfile]): İzlenen film ID'leri veya kullanıcı profili
+            exclude_movie_ids (Optional[List[int]]): Sayfalarda gösterilmeyecek film ID'leri
+            result_format (str): 'dict', 'record' veya 'dataframe' (varsayılan: 'dict')
+            filters (Optional[Dict[str, Any]]): Meta veri filtreleri (bkz. get_recommendations)
+            
+        Returns:
+            RecommendationCursor: İzlenen filmler hariç, skora göre sıralı öneri imleci
+        """
+        user_profile, watched_movie_ids = self._unpack_watched_movies(watched_movie_ids)
+        self._check_result_format(result_format)
+        filter_key = self._normalize_filters(filters)
+        
+        self._apply_pending_refit()
+        
+        watched_movie_indices, _ = self._lookup_movie_indices(watched_movie_ids)
+        if not watched_movie_indices:
+            raise ValueError("Hiçbir izlenen film veri setinde bulunamadı")
+        
+        if user_profile is not None:
+            user_profile_vector = user_profile.to_vector()
+        else:
+            user_profile_vector = self._get_user_profile(watched_movie_indices)
+        
+        # Tüm adayları bir kez sırala; sonraki sayfalar bu sıradan okunur
+        similarity_scores = self._score_profile(user_profile_vector)
+        ranked_indices = self._select_top_k(
+            similarity_scores, len(similarity_scores), watched_movie_indices, self._build_filter_mask(filter_key)
+        )
+        
+        cursor = RecommendationCursor(
+            self, ranked_indices, similarity_scores[ranked_indices],
+            frozenset(Counter(watched_movie_ids).items()), user_profile, result_format
+        )
+        if exclude_movie_ids:
+            cursor.exclude(exclude_movie_ids)
+        
+        return cursor
+    
+    def _normalize_filters(self, filters: Optional[Dict[str, Any]]) -> Optional[tuple]:
+        """
+        Filtreleri doğrular ve önbellek anahtarı olarak da kullanılan sıralı bir demete çevirir.
+        
+        Args:
+            filters (Optional[Dict[str, Any]]): Filtre anahtarı -> sınır değeri veya kategori değer(ler)i
+            
+        Returns:
+            Optional[tuple]: (anahtar, değer) çiftleri; filtre yoksa None
+        """
+        if not filters:
+            return None
+        
+        normalized = []
+        for key, value in filters.items():
+            if key in self.RANGE_FILTERS:
+                try:
+                    bound = float(value)
+                except (TypeError, ValueError):
+                    raise ValueError(f"'{key}' filtresi sayısal olmalıdır")
+                normalized.append((key, bound))
+            elif key in self.CATEGORY_FILTERS:
+                values = [value] if isinstance(value, str) else list(value)
+                tokens = tuple(sorted({str(item).strip().lower() for item in values}))
+                if not tokens:
+                    raise ValueError(f"'{key}' filtresi en az bir değer içermelidir")
+                normalized.append((key, tokens))
+            else:
+                raise ValueError(f"Bilinmeyen filtre: {key}")
+        
+        return tuple(sorted(normalized))
+    
+    def _get_filter_index(self, column: str) -> Dict[str, Any]:
+        """
+        Bir filtre sütununun indeksini döndürür; ilk kullanımda kurulur.
+        
+        Kategori sütunları için her değerin geçtiği filmler bit dizisi (np.packbits) olarak,
+        sayısal sütunlar için bilinen değerler sıralı dizi ve satır pozisyonları olarak tutulur.
+        
+        Args:
+            column (str): Filtre sütunu
+            
+        Returns:
+            Dict[str, Any]: Kategori sütunlarında değer -> bit dizisi, sayısal sütunlarda
+                'values' (artan değerler) ve 'positions' (aynı sıradaki satır pozisyonları)
+        """
+        index = self._filter_indexes.get(column)
+        if index is not None:
+            return index
+        
+        if column not in self.df.columns:
+            raise ValueError(f"'{column}' sütunu veri setinde yok; bu filtre kullanılamaz")
+        
+        num_movies = len(self.df)
+        if column in self.CATEGORY_FILTERS:
+            column_values = self.df[column].reset_index(drop=True).fillna('').astype(str)
+            tokens = column_values.str.lower().str.split(',').explode().str.strip()
+            tokens = tokens[tokens != '']
+            
+            codes, values = pd.factorize(tokens)
+            positions = tokens.index.to_numpy()
+            order = np.argsort(codes, kind='stable')
+            boundaries = np.flatnonzero(np.diff(codes[order])) + 1
+            
+            index = {}
+            for value, value_positions in zip(values, np.split(positions[order], boundaries)):
+                mask = np.zeros(num_movies, dtype=bool)
+                mask[value_positions] = True
+                index[value] = np.packbits(mask)
+        else:
+            values = self.df[column].to_numpy()
+            known = np.flatnonzero(values != 0)
+            order = known[np.argsort(values[known], kind='stable')]
+            index = {'values': values[order], 'positions': order}
+        
+        self._filter_indexes[column] = index
+        return index
+    
+    def _build_filter_mask(self, filter_key: Optional[tuple]) -> Optional[np.ndarray]:
+        """
+        Normalize filtreleri katalog uzunluğunda bir boolean maskeye çevirir.
+        
+        Bir kategori filtresindeki değerlerin bit dizileri VEYA, farklı filtrelerin
+        maskeleri VE ile birleştirilir. Aralık filtreleri sıralı indekste ikili arama ile
+        çözülür; aynı sütunun alt ve üst sınırı tek bir aralık olarak uygulanır.
+        
+        Args:
+            filter_key (Optional[tuple]): _normalize_filters çıktısı
+            
+        Returns:
+            Optional[np.ndarray]: Filtrelere uyan filmler için True; filtre yoksa None
+        """
+        if filter_key is None:
+            return None
+        
+        num_movies = len(self.df)
+        packed_mask = np.full((num_movies + 7) // 8, 0xFF, dtype=np.uint8)
+        ranges = {}
+        
+        for key, value in filter_key:
+            if key in self.CATEGORY_FILTERS:
+                index = self._get_filter_index(key)
+                value_bits = [index[token] for token in value if token in index]
+                if not value_bits:
+                    packed_mask[:] = 0
+                    continue
+                packed_mask &= np.bitwise_or.reduce(value_bits, axis=0)
+            else:
+                column, side = self.RANGE_FILTERS[key]
+                ranges.setdefault(column, {})[side] = value
+        
+        mask = np.unpackbits(packed_mask, count=num_movies).view(bool)
+        
+        for column, bounds in ranges.items():
+            index = self._get_filter_index(column)
+            values = index['values']
+            
+            # Ondalıklı sütunlarda sınır sütunun tipine çevrilir (float32 7.1 < float64 7.1 olmasın)
+            cast = values.dtype.type if np.issubdtype(values.dtype, np.floating) else float
+            start = np.searchsorted(values, cast(bounds['min']), side='left') if 'min' in bounds else 0
+            end = np.searchsorted(values, cast(bounds['max']), side='right') if 'max' in bounds else len(values)
+            
+            range_mask = np.zeros(num_movies, dtype=bool)
+            range_mask[index['positions'][start:end]] = True
+            mask &= range_mask
+        
+        print(f"🔎 Filtrelere uyan film sayısı: {int(np.count_nonzero(mask))}")
+        return mask
+    
+    def invalidate_cache(self):
+        """
+        Öneri önbelleğini temizler ve model sürümünü artırır.
+        
+        Katalog, model veya aday indeksleri değiştiğinde otomatik olarak çağrılır.
+        """
+        self.model_version += 1
+        self._recommendation_cache.clear()
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        """
+        Öneri önbelleğinin isabet/ıska sayaçlarını ve doluluğunu döndürür.
+        
+        Returns:
+            Dict[str, int]: hits, misses, size, max_size ve model_version
+        """
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'size': len(self._recommendation_cache),
+            'max_size': self.cache_size,
+            'model_version': self.model_version
+        }
+    
+    def _recommendation_cache_key(self, watched_movie_ids: List[int], num_recommendations: int,
+                                  result_format: str, filter_key: Optional[tuple] = None) -> tuple:
+        """İzlenen filmler (sırasız, tekrar sayılarıyla) ve öneri parametrelerinden önbellek anahtarı üretir."""
+        return (
+            frozenset(Counter(watched_movie_ids).items()),
+            num_recommendations,
+            result_format,
+            filter_key,
+            self.ann_n_probe,
+            self.model_version
+        )
+    
+    def _get_cached_recommendations(self, cache_key: tuple) -> Optional[Any]:
+        """Önbellekteki sonucun bir kopyasını döndürür (yoksa None) ve sayaçları günceller."""
+        if self.cache_size == 0:
+            return None
+        
+        if cache_key not in self._recommendation_cache:
+            self.cache_misses += 1
+            return None
+        
+        self.cache_hits += 1
+        self._recommendation_cache.move_to_end(cache_key)
+        return self._copy_recommendations(self._recommendation_cache[cache_key])
+    
+    def _store_cached_recommendations(self, cache_key: tuple, recommendations: Any):
+        """Sonucu önbelleğe ekler; kapasite aşılırsa en uzun süredir kullanılmayanı çıkarır."""
+        if self.cache_size == 0:
+            return
+        
+        self._recommendation_cache[cache_key] = self._copy_recommendations(recommendations)
+        self._recommendation_cache.move_to_end(cache_key)
+        while len(self._recommendation_cache) > self.cache_size:
+            self._recommendation_cache.popitem(last=False)
+    
+    @staticmethod
+    def _copy_recommendations(recommendations: Any) -> Any:
+        """Çağıranın değiştirmesi önbelleği bozmasın diye sonucun kopyasını üretir."""
+        if isinstance(recommendations, pd.DataFrame):
+            return recommendations.copy()
+        return [dict(item) if isinstance(item, dict) else item for item in recommendations]
+    
+    def get_recommendations_batch(self, users: Dict[Any, List[int]], num_recommendations: int = 10,
+                                  batch_size: int = 256, result_format: str = 'dict',
+                                  filters: Optional[Dict[str, Any]] = None) -> Union[Dict[Any, list], pd.DataFrame]:
+        """
+        Birden fazla kullanıcı için önerileri tek seferde üretir.
+        
+        Tüm kullanıcı profilleri tek bir seyrek matris olarak kurulur ve katalogla
+        blok blok çarpılır; her blokta en fazla batch_size x film sayısı kadar skor tutulur.
+        İzlenen filmler her kullanıcı için ayrı ayrı maskelenir.
+        
+        Args:
+            users (Dict[Any, List[int]]): Kullanıcı ID'si -> izlenen film ID'leri
+            num_recommendations (int): Kullanıcı başına önerilecek film sayısı (varsayılan: 10)
+            batch_size (int): Aynı anda skorlanacak kullanıcı sayısı (bellek sınırı)
+            result_format (str): 'dict', 'record' veya 'dataframe' (varsayılan: 'dict')
+            filters (Optional[Dict[str, Any]]): Tüm kullanıcılara uygulanacak meta veri filtreleri
+                (bkz. get_recommendations)
+            
+        Returns:
+            Union[Dict[Any, list], pd.DataFrame]: Kullanıcı ID'si -> önerilen filmler
+                (hiçbir filmi veri setinde bulunamayan kullanıcılar için boş liste);
+                'dataframe' biçiminde tüm öneriler user_id sütunlu tek bir DataFrame'dir
+        """
+        if num_recommendations <= 0:
+            raise ValueError("Öneri sayısı pozitif olmalıdır")
+        
+        if batch_size <= 0:
+            raise ValueError("Blok boyutu pozitif olmalıdır")
+        
+        self._check_result_format(result_format)
+        filter_key = self._normalize_filters(filters)
+        
+        self._apply_pending_refit()
+        
+        results = {user_id: [] for user_id in users}
+        
+        # Her kullanıcının izlediği filmleri satır pozisyonlarına çevir
+        user_ids = []
+        watched_indices_per_user = []
+        missing_count = 0
+        
+        for user_id, watched_movie_ids in users.items():
+            indices = [self._id_to_index[movie_id] for movie_id in watched_movie_ids if movie_id in self._id_to_index]
+            missing_count += len(watched_movie_ids) - len(indices)
+            if indices:
+                user_ids.append(user_id)
+                watched_indices_per_user.append(indices)
+        
+        if missing_count:
+            print(f"⚠️  {missing_count} film ID'si veri setinde bulunamadı")
+        
+        if not user_ids:
+            return self._build_batch_results(results, user_ids, [], [], [], result_format)
+        
+        # Ağırlık matrisi (kullanıcı x film): her satır, kullanıcının izlediği filmlerin normalize ağırlıkları
+        rows, cols, weights = [], [], []
+        for row_number, indices in enumerate(watched_indices_per_user):
+            user_weights = self._get_movie_weights(indices)
+            rows.extend([row_number] * len(indices))
+            cols.extend(indices)
+            weights.extend(user_weights / user_weights.sum())
+        
+        weight_matrix = sparse.csr_matrix(
+            (weights, (rows, cols)), shape=(len(user_ids), self.tfidf_matrix.shape[0]), dtype=self.tfidf_matrix.dtype
+        )
+        
+        # Tüm kullanıcı profilleri tek bir seyrek matris çarpımıyla
+        profile_matrix = sparse.csr_matrix(weight_matrix @ self.tfidf_matrix)
+        profile_norms = np.sqrt(np.asarray(profile_matrix.multiply(profile_matrix).sum(axis=1)).ravel())
+        profile_norms[profile_norms == 0] = 1.0
+        
+        filter_mask = self._build_filter_mask(filter_key)
+        
+        # Tüm kullanıcıların seçilen filmleri; sonuçlar en sonda tek seferde kurulur
+        selected_users, selected_indices, selected_scores = [], [], []
+        
+        for start in range(0, len(user_ids), batch_size):
+            end = min(start + batch_size, len(user_ids))
+            
+            # Blok skorları: (blok kullanıcıları x film)
+            block_profiles = profile_matrix[start:end].toarray()
+            block_scores = np.asarray(self.tfidf_matrix @ block_profiles.T).T
+            block_scores /= profile_norms[start:end, None]
+            
+            # İzlenen filmleri ve pozitif olmayan skorları maskele
+            block_scores[block_scores <= 0] = -np.inf
+            watched_rows, watched_cols = weight_matrix[start:end].nonzero()
+            block_scores[watched_rows, watched_cols] = -np.inf
+            if filter_mask is not None:
+                block_scores[:, ~filter_mask] = -np.inf
+            
+            top_indices, top_scores = self._top_k_per_row(block_scores, num_recommendations)
+            valid = np.isfinite(top_scores)
+            selected_users.append(start + np.nonzero(valid)[0])
+            selected_indices.append(top_indices[valid])
+            selected_scores.append(top_scores[valid])
+        
+        print(f"📦 {len(user_ids)} kullanıcı için toplu öneri oluşturuldu")
+        return self._build_batch_results(
+            results, user_ids, np.concatenate(selected_users), np.concatenate(selected_indices),
+            np.concatenate(selected_scores), result_format
+        )
+    
+    def _build_batch_results(self, results: Dict[Any, list], user_ids: List[Any], user_positions: np.ndarray,
+                             movie_indices: np.ndarray, similarity_scores: np.ndarray,
+                             result_format: str) -> Union[Dict[Any, list], pd.DataFrame]:
+        """
+        Toplu önerilerin sonuçlarını tek seferde kurar ve kullanıcılara dağıtır.
+        
+        Args:
+            results (Dict[Any, list]): Tüm kullanıcılar için boş listelerle başlatılmış sonuçlar
+            user_ids (List[Any]): Skorlanan kullanıcılar
+            user_positions (np.ndarray): Her öneri için user_ids içindeki pozisyon (artan sırada)
+            movie_indices (np.ndarray): Önerilen filmlerin satır pozisyonları
+            similarity_scores (np.ndarray): Benzerlik skorları
+            result_format (str): 'dict', 'record' veya 'dataframe'
+            
+        Returns:
+            Union[Dict[Any, list], pd.DataFrame]: Kullanıcı ID'si -> öneriler veya tek DataFrame
+        """
+        recommendations = self._build_recommendations(movie_indices, similarity_scores, result_format)
+        user_positions = np.asarray(user_positions, dtype=np.intp)
+        
+        if result_format == 'dataframe':
+            recommendations.insert(0, 'user_id', np.asarray(user_ids, dtype=object)[user_positions])
+            return recommendations
+        
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(user_positions, minlength=len(user_ids)))])
+        for position, user_id in enumerate(user_ids):
+            results[user_id] = recommendations[offsets[position]:offsets[position + 1]]
+        
+        return results
+    
+    @staticmethod
+    def _top_k_per_row(score_matrix: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Skor matrisinin her satırı için en yüksek skorlu k sütunu sabit boyutlu dizilerde döndürür.
+        
+        Args:
+            score_matrix (np.ndarray): (satır x sütun) skor matrisi; elenen hücreler -inf olmalı
+            k (int): Satır başına seçilecek sütun sayısı
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (satır x k) sütun pozisyonları ve skorları, skora göre
+                azalan sırada (eşit skorlarda küçük pozisyon önce); -inf skorlu hücreler boş yerlerdir
+        """
+        num_columns = score_matrix.shape[1]
+        k = min(k, num_columns)
+        
+        if k < num_columns:
+            top_indices = np.argpartition(-score_matrix, k - 1, axis=1)[:, :k]
+        else:
+            top_indices = np.tile(np.arange(num_columns), (score_matrix.shape[0], 1))
+        
+        top_scores = np.take_along_axis(score_matrix, top_indices, axis=1)
+        order = np.lexsort((top_indices, -top_scores), axis=-1)
+        
+        return np.take_along_axis(top_indices, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+    
+    def _check_result_format(self, result_format: str):
+        """Sonuç biçiminin desteklendiğini doğrular."""
+        if result_format not in self.RESULT_FORMATS:
+            raise ValueError(f"Geçersiz sonuç biçimi: {result_format} (desteklenenler: {', '.join(self.RESULT_FORMATS)})")
+    
+    def _build_recommendations(self, movie_indices: np.ndarray, similarity_scores: np.ndarray,
+                               result_format: str = 'dict') -> Union[List[Dict[str, Any]], List[Recommendation], pd.DataFrame]:
+        """
+        Seçilen satır pozisyonları için öneri sonuçlarını sütun dizilerinden tek seferde oluşturur.
+        
+        Args:
+            movie_indices (np.ndarray): Önerilen filmlerin satır pozisyonları
+            similarity_scores (np.ndarray): Aynı sırada benzerlik skorları
+            result_format (str): 'dict', 'record' veya 'dataframe'
+            
+        Returns:
+            Union[List[Dict[str, Any]], List[Recommendation], pd.DataFrame]: Öneriler
+        """
+        movie_indices = np.asarray(movie_indices, dtype=np.intp)
+        
+        fields = {column: self._result_columns[column][movie_indices] for column in self.RESULT_COLUMNS}
+        fields['similarity_score'] = np.asarray(similarity_scores, dtype=np.float64)
+        
+        if result_format == 'dataframe':
+            return pd.DataFrame(fields, columns=list(Recommendation._fields))
+        
+        rows = zip(*(fields[field].tolist() for field in Recommendation._fields))
+        if result_format == 'record':
+            return [Recommendation._make(row) for row in rows]
+        
+        return [dict(zip(Recommendation._fields, row)) for row in rows]
+    
+    def get_movie_info(self, movie_id: int) -> Dict[str, Any]:
+        """
+        Belirli bir filmin bilgilerini getirir.
+        
+        Args:
+            movie_id (int): Film ID'si
+            
+        Returns:
+            Dict[str, Any]: Film bilgileri
+        """
+        index = self._id_to_index.get(movie_id)
+        
+        if index is None:
+            raise ValueError(f"Film ID {movie_id} bulunamadı")
+        
+        return self._build_movie_info(index)
+    
+    def get_movies_info(self, movie_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Birden fazla filmin bilgilerini tek seferde getirir.
+        
+        Args:
+            movie_ids (List[int]): Film ID'leri
+            
+        Returns:
+            List[Dict[str, Any]]: Bulunan filmlerin bilgileri (giriş sırasıyla, bulunamayanlar atlanır)
+        """
+        indices, _ = self._lookup_movie_indices(movie_ids)
+        return [self._build_movie_info(index) for index in indices]
+    
+    def _build_movie_info(self, index: int) -> Dict[str, Any]:
+        """Verilen satır pozisyonundaki filmin bilgi sözlüğünü oluşturur."""
+        row = self.df.iloc[index]
+        
+        movie_info = {
+            'movie_id': int(row['movie_id']),
+            'title': row['title'],
+            'genres': row['genres'],
+            'director': row['director'],
+            'actors': row['actors'],
+            'plot_summary': row['plot_summary']
+        }
+        
+        return movie_info
+    
+    @staticmethod
+    def _normalize_search_text(text: str) -> str:
+        """
+        Arama indeksinde ve sorgularda kullanılan metin biçimi.
+        
+        Büyük/küçük harf Unicode kurallarıyla katlanır, Türkçe noktasız ı 'i' sayılır ve aksan
+        işaretleri atılır; böylece "Eşkıya", "ESKIYA" ve "eskiya" aynı anahtara düşer.
+        """
+        if text.isascii():
+            return text.lower()
+        
+        text = unicodedata.normalize('NFKD', text.replace('ı', 'i').casefold())
+        return ''.join(char for char in text if not unicodedata.combining(char))
+    
+    @staticmethod
+    def _build_postings(keys: List[Any], rows: List[int]) -> Tuple[Dict[Any, int], np.ndarray, np.ndarray]:
+        """
+        (anahtar, sıra) çiftlerinden CSR biçiminde ters indeks listeleri kurar.
+        
+        Args:
+            keys (List[Any]): Anahtarlar (trigram, kelime, ...)
+            rows (List[int]): Her anahtarın geçtiği sıra numarası (artan sırayla eklenmiş)
+            
+        Returns:
+            Tuple[Dict[Any, int], np.ndarray, np.ndarray]: anahtar -> liste numarası, indptr ve
+                listelerin birleşik sıra numaraları (her liste artan sırada)
+        """
+        codes, unique_keys = pd.factorize(np.array(keys, dtype=object))
+        key_order = np.argsort(codes, kind='stable')
+        
+        slots = {key: slot for slot, key in enumerate(unique_keys)}
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(unique_keys)))])
+        return slots, indptr, np.asarray(rows, dtype=np.int32)[key_order]
+    
+    def _get_title_index(self) -> Dict[str, Any]:
+        """
+        Başlık araması için karakter trigram ters indeksini döndürür; ilk aramada kurulur.
+        
+        Filmler arama sırasına (satır sırası) dizilir ve her trigramın
+        geçtiği filmlerin sıra numaraları artan bir dizide tutulur. Böylece dizilerin kesişimi
+        adayları zaten gösterim sırasında verir; doğrulama ilk max_results eşleşmede durabilir.
+        Anahtarlar _normalize_search_text ile katlanmış metinden üretilir.
+        
+        Returns:
+            Dict[str, Any]: 'order' (sıra -> satır pozisyonu), 'texts' (sıradaki aranabilir metin),
+                'grams' (trigram -> liste numarası), 'indptr' ve 'ranks' (CSR biçiminde listeler)
+        """
+        if self._title_index is not None:
+            return self._title_index
+        
+        columns = [column for column in self.SEARCH_COLUMNS if column in self.df.columns]
+        titles = self.df[columns[0]].fillna('').astype(str)
+        
+        # Alanlar satır sonuyla ayrılır (sorgular satır sonu içermez, alanlar arası eşleşme olmaz);
+        # başlıkla aynı olan alternatif başlıklar tekrar eklenmez
+        texts = titles
+        for column in columns[1:]:
+            values = self.df[column].fillna('').astype(str)
+            texts = texts + ('\n' + values).where(values != titles, '')
+        
+        # Arama sırası: satır sırası
+        order = np.arange(len(self.df))
+        
+        texts = texts.to_numpy(dtype=object)[order]
+        texts = [self._normalize_search_text(text) for text in texts.tolist()]
+        
+        n = self.SEARCH_NGRAM
+        grams, ranks = [], []
+        for rank, text in enumerate(texts):
+            text_grams = {text[i:i + n] for i in range(len(text) - n + 1)}
+            grams.extend(text_grams)
+            ranks.extend([rank] * len(text_grams))
+        
+        gram_slots, indptr, gram_ranks = self._build_postings(grams, ranks)
+        
+        self._title_index = {
+            'order': order,
+            'texts': texts,
+            'grams': gram_slots,
+            'indptr': indptr,
+            'ranks': gram_ranks
+        }
+        return self._title_index
+    
+    def _get_title_word_index(self) -> Dict[str, Any]:
+        """
+        Bulanık başlık araması için kelime indeksini döndürür; ilk bulanık aramada kurulur.
+        
+        Başlıklardaki farklı kelimelerden bir sözlük çıkarılır. Her kelime için geçtiği
+        filmlerin sıra numaraları, sözlük için de kenar işaretli ('$kelime$') trigramlardan
+        kelimelere bir ters indeks tutulur. Yazım hatalı bir sorgu kelimesinin adayları bu
+        trigram indeksinden, başlık sayısından bağımsız olarak bulunur.
+        
+        Returns:
+            Dict[str, Any]: 'vocabulary' (kelimeler), 'lengths' (kelime uzunlukları),
+                'words', 'word_indptr', 'word_ranks' (kelime -> film sıraları) ve
+                'grams', 'gram_indptr', 'gram_words' (trigram -> sözlük kelimeleri)
+        """
+        if self._title_word_index is not None:
+            return self._title_word_index
+        
+        words, ranks = [], []
+        for rank, text in enumerate(self._get_title_index()['texts']):
+            text_words = set(re.findall(r'\w+', text))
+            words.extend(text_words)
+            ranks.extend([rank] * len(text_words))
+        word_slots, word_indptr, word_ranks = self._build_postings(words, ranks)
+        vocabulary = list(word_slots)
+        
+        n = self.SEARCH_NGRAM
+        grams, gram_words = [], []
+        for slot, word in enumerate(vocabulary):
+            padded = f'${word}$'
+            word_grams = {padded[i:i + n] for i in range(len(padded) - n + 1)}
+            grams.extend(word_grams)
+            gram_words.extend([slot] * len(word_grams))
+        gram_slots, gram_indptr, gram_word_slots = self._build_postings(grams, gram_words)
+        
+        self._title_word_index = {
+            'vocabulary': vocabulary,
+            'lengths': np.array([len(word) for word in vocabulary], dtype=np.int32),
+            'words': word_slots,
+            'word_indptr': word_indptr,
+            'word_ranks': word_ranks,
+            'grams': gram_slots,
+            'gram_indptr': gram_indptr,
+            'gram_words': gram_word_slots
+        }
+        return self._title_word_index
+    
+    def _find_title_positions(self, query: str, max_results: int) -> np.ndarray:
+        """
+        Sorguyu alt dize olarak içeren filmleri arama sırasına göre bulur.
+        
+        Sorgunun trigramlarının listeleri en kısadan başlayarak kesiştirilir, kalan adaylarda
+        alt dize doğrulanır. Trigramdan kısa sorgular tüm metinlerin sırayla taranmasıyla yanıtlanır.
+        
+        Args:
+            query (str): Arama terimi (düz metin, regex değil)
+            max_results (int): Maksimum sonuç sayısı
+            
+        Returns:
+            np.ndarray: Eşleşen filmlerin satır pozisyonları
+        """
+        index = self._get_title_index()
+        query = self._normalize_search_text(query)
+        texts = index['texts']
+        n = self.SEARCH_NGRAM
+        
+        if len(query) < n:
+            candidates = range(len(texts))
+        else:
+            slots = {index['grams'].get(query[i:i + n]) for i in range(len(query) - n + 1)}
+            if None in slots:
+                return np.empty(0, dtype=np.int64)
+            
+            indptr, ranks = index['indptr'], index['ranks']
+            postings = sorted((ranks[indptr[slot]:indptr[slot + 1]] for slot in slots), key=len)
+            candidates = postings[0]
+            for posting in postings[1:]:
+                candidates = np.intersect1d(candidates, posting, assume_unique=True)
+            candidates = candidates.tolist()
+        
+        matches = []
+        for rank in candidates:
+            if len(matches) >= max_results:
+                break
+            if query in texts[rank]:
+                matches.append(rank)
+        
+        return index['order'][np.asarray(matches, dtype=np.int64)]
+    
+    @staticmethod
+    def _bounded_edit_distance(source: str, target: str, max_distance: int) -> int:
+        """
+        İki kelime arasındaki Levenshtein mesafesini hesaplar; sınır aşılınca erken durur.
+        
+        Args:
+            source (str): Birinci kelime
+            target (str): İkinci kelime
+            max_distance (int): İlgilenilen en büyük mesafe
+            
+        Returns:
+            int: Mesafe; max_distance'ı aşıyorsa max_distance + 1
+        """
+        if abs(len(source) - len(target)) > max_distance:
+            return max_distance + 1
+        
+        previous = list(range(len(target) + 1))
+        for i, source_char in enumerate(source, 1):
+            current = [i]
+            for j, target_char in enumerate(target, 1):
+                current.append(min(previous[j] + 1, current[j - 1] + 1,
+                                   previous[j - 1] + (source_char != target_char)))
+            if min(current) > max_distance:
+                return max_distance + 1
+            previous = current
+        
+        return min(previous[-1], max_distance + 1)
+    
+    def _match_vocabulary_words(self, word: str) -> List[Tuple[int, int]]:
+        """
+        Sorgu kelimesine düzenleme sınırı içinde benzeyen sözlük kelimelerini bulur.
+        
+        k düzenleme bir kelimenin en fazla k * n trigramını bozar; bu yüzden adaylar, sorgunun
+        kenar işaretli trigramlarından en az (trigram sayısı - k * n) tanesini paylaşan ve
+        uzunluğu en fazla k farklı olan kelimelerdir. Mesafe yalnızca bu adaylar için hesaplanır.
+        
+        Args:
+            word (str): Katlanmış sorgu kelimesi
+            
+        Returns:
+            List[Tuple[int, int]]: (sözlük kelimesi numarası, düzenleme mesafesi) çiftleri
+        """
+        index = self._get_title_word_index()
+        max_edits = next((edits for min_length, edits in self.FUZZY_EDIT_LIMITS if len(word) >= min_length), 0)
+        if max_edits == 0:
+            slot = index['words'].get(word)
+            return [(slot, 0)] if slot is not None else []
+        
+        n = self.SEARCH_NGRAM
+        padded = f'${word}$'
+        grams = {padded[i:i + n] for i in range(len(padded) - n + 1)}
+        gram_slots = [index['grams'][gram] for gram in grams if gram in index['grams']]
+        if not gram_slots:
+            return []
+        
+        indptr, gram_words = index['gram_indptr'], index['gram_words']
+        counts = np.bincount(
+            np.concatenate([gram_words[indptr[slot]:indptr[slot + 1]] for slot in gram_slots]),
+            minlength=len(index['vocabulary'])
+        )
+        threshold = max(len(grams) - n * max_edits, 1)
+        candidates = np.flatnonzero((counts >= threshold) & (np.abs(index['lengths'] - len(word)) <= max_edits))
+        
+        matches = []
+        for slot in candidates.tolist():
+            distance = self._bounded_edit_distance(word, index['vocabulary'][slot], max_edits)
+            if distance <= max_edits:
+                matches.append((slot, distance))
+        return matches
+    
+    def _find_fuzzy_title_positions(self, query: str) -> np.ndarray:
+        """
+        Sorgunun her kelimesini, yazım hatası sınırı içinde benzer bir kelime olarak içeren filmleri bulur.
+        
+        Args:
+            query (str): Arama terimi
+            
+        Returns:
+            np.ndarray: Eşleşen filmlerin satır pozisyonları; toplam düzenleme mesafesine,
+                eşitlikte arama sırasına göre
+        """
+        index = self._get_title_word_index()
+        order = self._get_title_index()['order']
+        empty = np.empty(0, dtype=np.int64)
+        
+        query_words = re.findall(r'\w+', self._normalize_search_text(query))
+        if not query_words:
+            return empty
+        
+        candidates, distances = None, None
+        for word in query_words:
+            matches = self._match_vocabulary_words(word)
+            if not matches:
+                return empty
+            
+            # Bu kelimeye uyan filmler; film birden fazla benzer kelime içeriyorsa en küçük mesafe
+            ranks = np.concatenate([index['word_ranks'][index['word_indptr'][slot]:index['word_indptr'][slot + 1]]
+                                    for slot, _ in matches])
+            word_distances = np.concatenate([
+                np.full(index['word_indptr'][slot + 1] - index['word_indptr'][slot], distance)
+                for slot, distance in matches
+            ])
+            best = np.lexsort((word_distances, ranks))
+            ranks, word_distances = ranks[best], word_distances[best]
+            first = np.concatenate([[True], ranks[1:] != ranks[:-1]])
+            ranks, word_distances = ranks[first], word_distances[first]
+            
+            # Sorgu kelimeleri VE ile birleşir, mesafeler toplanır
+            if candidates is None:
+                candidates, distances = ranks, word_distances
+            else:
+                candidates, left, right = np.intersect1d(candidates, ranks, assume_unique=True, return_indices=True)
+                distances = distances[left] + word_distances[right]
+            if len(candidates) == 0:
+                return empty
+        
+        return order[candidates[np.lexsort((candidates, distances))]]
+    
+    def search_movies(self, query: str, max_results: int = 10, fuzzy: bool = False) -> List[Dict[str, Any]]:
+        """
+        Film başlığında arama yapar.
+        
+        Args:
+            query (str): Arama terimi
+            max_results (int): Maksimum sonuç sayısı
+            fuzzy (bool): True ise tam eşleşmelerden sonra, sorgu kelimelerini birkaç harf
+                hatayla içeren filmler de döndürülür (ör. "eskya" -> "Eşkıya")
+            
+        Returns:
+            List[Dict[str, Any]]: Bulunan filmlerin listesi
+        """
+        if not query.strip():
+            raise ValueError("Arama terimi boş olamaz")
+        
+        # Başlıkta trigram indeksiyle ara (büyük/küçük harf ve aksan duyarsız)
+        positions = self._find_title_positions(query, max_results)
+        
+        if fuzzy and len(positions) < max_results:
+            # Kalan yerleri yazım hatası toleranslı kelime eşleşmeleriyle doldur
+            fuzzy_positions = self._find_fuzzy_title_positions(query)
+            fuzzy_positions = fuzzy_positions[~np.isin(fuzzy_positions, positions)]
+            positions = np.concatenate([positions, fuzzy_positions])[:max_results]
+        
+        rows = zip(*(self._result_columns[column][positions].tolist() for column in self.RESULT_COLUMNS))
+        return [dict(zip(self.RESULT_COLUMNS, row)) for row in rows]
     
     def get_stats(self) -> Dict[str, Any]:
         """
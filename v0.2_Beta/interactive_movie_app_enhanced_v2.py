@@ -8,16 +8,30 @@ daha iyi öneriler sunar. Gelişmiş özellikler içerir.
 import os
 from content_based_recommender import ContentBasedRecommender
 
+# Eğitilmiş modellerin saklandığı dizin (katalog değişmedikçe yeniden eğitim yapılmaz)
+MODEL_CACHE_DIR = 'model_cache'
+
 
 class InteractiveMovieRecommender:
     """İnteraktif film önerme uygulaması"""
     
     def __init__(self, movie_data_path: str):
         """Uygulamayı başlat"""
-        self.recommender = ContentBasedRecommender(movie_data_path)
+        self.recommender = ContentBasedRecommender(movie_data_path, model_cache_dir=MODEL_CACHE_DIR)
+        
+        # Birkaç filmle başlayan turlar için komşu tablosu (önbellekte yoksa bir kez hesaplanır)
+        if self.recommender.neighbor_indices is None:
+            self.recommender.build_neighbor_graph()
         self.user_movies = []  # Kullanıcının seçtiği filmler
+        self.user_profile = self.recommender.create_user_profile()  # Her seçimde artımlı güncellenir
         self.round_number = 0
         self.shown_recommendations = set()  # Gösterilen önerileri takip et
+        self.recommendation_cursor = None  # "Yeni öneriler" sayfalarının imleci (turda bir kez skorlanır)
+        
+    def add_user_movie(self, movie_id: int):
+        """Seçilen filmi listeye ve zevk profiline ekle"""
+        self.user_movies.append(movie_id)
+        self.user_profile.add_movie(movie_id)
         
     def clear_screen(self):
         """Ekranı temizle"""
@@ -34,8 +48,7 @@ class InteractiveMovieRecommender:
         """Kullanıcının mevcut film listesini göster"""
         if self.user_movies:
             print(f"📚 Şu ana kadar seçtiğiniz filmler ({len(self.user_movies)} adet):")
-            for i, movie_id in enumerate(self.user_movies, 1):
-                movie_info = self.recommender.get_movie_info(movie_id)
+            for i, movie_info in enumerate(self.recommender.get_movies_info(self.user_movies), 1):
                 print(f"   {i}. {movie_info['title']} ({movie_info['genres']})")
             print()
     
@@ -51,8 +64,8 @@ class InteractiveMovieRecommender:
                 print("❌ Lütfen bir film adı girin!")
                 continue
                 
-            # Arama yap
-            search_results = self.recommender.search_movies(search_query, max_results=10)
+            # Arama yap (yazım hatalarına ve Türkçe karakter farklarına toleranslı)
+            search_results = self.recommender.search_movies(search_query, max_results=10, fuzzy=True)
             
             if not search_results:
                 print(f"❌ '{search_query}' ile eşleşen film bulunamadı. Tekrar deneyin.")
@@ -107,21 +120,15 @@ class InteractiveMovieRecommender:
         try:
             print("🔄 Sistem daha geniş arama yapıyor...")
             
-            # Daha fazla öneri al
-            all_recommendations = self.recommender.get_recommendations(
-                watched_movie_ids=self.user_movies,
-                num_recommendations=100  # Çok geniş pool
-            )
+            # Profil değişmediyse turun imlecinden sıradaki sayfayı al; gösterilenler hariç tutulur
+            if self.recommendation_cursor is None or self.recommendation_cursor.is_stale:
+                self.recommendation_cursor = self.recommender.create_recommendation_cursor(
+                    self.user_profile, exclude_movie_ids=self.shown_recommendations
+                )
+            else:
+                self.recommendation_cursor.exclude(self.shown_recommendations)
             
-            # Daha önce gösterilmemiş önerileri filtrele
-            new_recommendations = []
-            for rec in all_recommendations:
-                if rec['movie_id'] not in self.shown_recommendations:
-                    new_recommendations.append(rec)
-                    
-                    # 4 tane bulduğumuzda dur
-                    if len(new_recommendations) >= 4:
-                        break
+            new_recommendations = self.recommendation_cursor.next_page(4)
             
             if new_recommendations:
                 print(f"✅ {len(new_recommendations)} yeni öneri bulundu!")
@@ -140,6 +147,7 @@ class InteractiveMovieRecommender:
     def reset_shown_recommendations(self):
         """Her yeni tur başında gösterilen önerileri sıfırla"""
         self.shown_recommendations.clear()
+        self.recommendation_cursor = None
             
     def select_from_recommendations(self, recommendations):
         """Önerilerden film seçme veya alternatif seçenekler"""
@@ -194,7 +202,7 @@ class InteractiveMovieRecommender:
         # İlk 3 filmi seç
         for i in range(3):
             movie_id = self.search_and_select_movie(f"📝 {i+1}. filminizi seçin:")
-            self.user_movies.append(movie_id)
+            self.add_user_movie(movie_id)
             
             # Seçilen filmi göster
             movie_info = self.recommender.get_movie_info(movie_id)
@@ -215,7 +223,7 @@ class InteractiveMovieRecommender:
         
         # Önerileri al
         recommendations = self.recommender.get_recommendations(
-            watched_movie_ids=self.user_movies,
+            watched_movie_ids=self.user_profile,
             num_recommendations=4
         )
         
@@ -234,7 +242,7 @@ class InteractiveMovieRecommender:
             print("⏭️ Tur atlandı, devam ediliyor...")
             return True
             
-        self.user_movies.append(selected_movie_id)
+        self.add_user_movie(selected_movie_id)
         
         # Seçimi onayla
         movie_info = self.recommender.get_movie_info(selected_movie_id)
@@ -2,9 +2,63 @@
 ContentBasedRecommender Sınıfı Test ve Örnek Kullanım
 """
 
+import contextlib
+import io
+import json
+import os
+import tempfile
+
+import pandas as pd
+
 from content_based_recommender import ContentBasedRecommender
 
 
+def test_save_load_after_add_movies(movie_data_path: str = 'processed_tmdb_movies.csv', num_added: int = 20):
+    """add_movies/remove_movies sonrası kaydedilen modelin load_model ile aynen geri yüklendiğini test eder"""
+    print("\n🔁 Artımlı Güncelleme Sonrası Kayıt/Yükleme Testi:")
+    
+    catalog_df = pd.read_csv(movie_data_path)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        base_path = os.path.join(tmp_dir, 'base_movies.csv')
+        catalog_df.iloc[:-num_added].to_csv(base_path, index=False)
+        model_dir = os.path.join(tmp_dir, 'model')
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            updated = ContentBasedRecommender(base_path)
+            updated.add_movies(catalog_df.iloc[-num_added:])
+            updated.remove_movies(catalog_df['movie_id'].iloc[:3].tolist())
+            updated.save_model(model_dir)
+            
+            restored = ContentBasedRecommender(base_path)
+            restored.load_model(model_dir)
+            
+            watched_movies = updated.df['movie_id'].tolist()[-5:]
+            expected = [rec['movie_id'] for rec in updated.get_recommendations(watched_movies, 10)]
+            actual = [rec['movie_id'] for rec in restored.get_recommendations(watched_movies, 10)]
+        
+        assert updated.df.equals(restored.df), "Geri yüklenen katalog farklı"
+        assert (updated.tfidf_matrix != restored.tfidf_matrix).nnz == 0, "Geri yüklenen TF-IDF matrisi farklı"
+        assert expected == actual, "Geri yüklenen modelin önerileri farklı"
+        print(f"   ✅ {len(restored.df)} film, aynı katalog, matris ve öneriler")
+        
+        # Katalog hash'i eşleşmeyen artefakt reddedilmeli
+        meta_path = os.path.join(model_dir, 'meta.json')
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        meta['catalog_hash'] = '0' * 64
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                restored.load_model(model_dir)
+        except ValueError:
+            print("   ✅ Katalog hash'i bozulmuş artefakt reddedildi")
+        else:
+            raise AssertionError("Katalog hash'i eşleşmeyen artefakt yüklendi")
+
+
 def main():
     """Ana test fonksiyonu"""
     
@@ -47,6 +101,9 @@ def main():
         for result in search_results:
             print(f"   • {result['title']} - {result['director']}")
         
+        # Artımlı güncelleme sonrası kayıt/yükleme
+        test_save_load_after_add_movies()
+        
         print("\n✅ Test başarıyla tamamlandı!")
         
     except Exception as e:
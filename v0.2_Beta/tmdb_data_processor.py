@@ -5,12 +5,69 @@ TMDB Dataset İşleyici - JSON formatındaki TMDB verilerini işler
 import pandas as pd
 import json
 import ast
-from typing import List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Callable, Optional
+
+
+def _map_partition(func: Callable[[Any], str], values: list) -> list:
+    """Süreç havuzu işçisinde bir sütun bölümünü çözer (bkz. TMDBDataProcessor.process_tmdb_dataset)."""
+    return [func(value) for value in values]
 
 
 class TMDBDataProcessor:
     """TMDB dataset'ini işlemek için yardımcı sınıf"""
     
+    # İşlenmiş dataset kaydedilirken yazılan sütunlar (content_based_recommender formatı)
+    OUTPUT_COLUMNS = ['movie_id', 'title', 'genres', 'director', 'actors', 'plot_summary']
+    
+    # Credits dosyası bu kadar satırlık parçalar halinde okunup indirgenir (ham cast/crew bellekte birikmez)
+    CREDITS_CHUNKSIZE = 10000
+    
+    @staticmethod
+    def _parse_json_list(json_str: str) -> list:
+        """
+        JSON formatındaki liste string'ini çözer
+        
+        Önce hızlı json.loads denenir; TMDB dökümlerinin bir kısmında bulunan Python
+        literal biçimindeki satırlar (tek tırnak, None) için ast.literal_eval'e düşülür.
+        
+        Args:
+            json_str (str): JSON (veya Python literal) formatındaki string
+            
+        Returns:
+            list: Çözülen liste (boş, geçersiz veya liste olmayan değerlerde boş liste)
+        """
+        if pd.isna(json_str) or json_str == '[]':
+            return []
+        
+        try:
+            data = json.loads(json_str)
+        except (TypeError, ValueError):
+            try:
+                data = ast.literal_eval(json_str)
+            except (ValueError, SyntaxError):
+                return []
+        
+        return data if isinstance(data, list) else []
+    
+    @staticmethod
+    def _name_value(item: dict, key: str = 'name') -> str:
+        """
+        Bir JSON kaydındaki ad değerini string olarak döndürür
+        
+        JSON null (veya string olmayan) değerler, anahtarın hiç olmadığı durumdaki gibi boş string
+        sayılır; böylece virgülle birleştirme eski sürümdeki gibi boş adları korur ("", "A" -> ", A").
+        
+        Args:
+            item (dict): Cast/crew/tür kaydı
+            key (str): Okunacak anahtar
+            
+        Returns:
+            str: Ad (yoksa boş string)
+        """
+        value = item.get(key, '')
+        return value if isinstance(value, str) else ''
+    
     @staticmethod
     def extract_names_from_json(json_str: str, key: str = 'name') -> str:
         """
@@ -23,18 +80,10 @@ class TMDBDataProcessor:
         Returns:
             str: Virgülle ayrılmış name değerleri
         """
-        if pd.isna(json_str) or json_str == '[]':
-            return ''
-        
-        try:
-            # JSON string'i parse et
-            data = ast.literal_eval(json_str)
-            if isinstance(data, list):
-                names = [item.get(key, '') for item in data if isinstance(item, dict)]
-                return ', '.join(names)
-            return ''
-        except (ValueError, SyntaxError):
-            return ''
+        # JSON string'i parse et
+        data = TMDBDataProcessor._parse_json_list(json_str)
+        names = [TMDBDataProcessor._name_value(item, key) for item in data if isinstance(item, dict)]
+        return ', '.join(names)
     
     @staticmethod
     def get_director_from_crew(crew_json: str) -> str:
@@ -47,18 +96,11 @@ class TMDBDataProcessor:
         Returns:
             str: Yönetmen adı
         """
-        if pd.isna(crew_json) or crew_json == '[]':
-            return ''
-        
-        try:
-            crew_data = ast.literal_eval(crew_json)
-            if isinstance(crew_data, list):
-                for person in crew_data:
-                    if isinstance(person, dict) and person.get('job') == 'Director':
-                        return person.get('name', '')
-            return ''
-        except (ValueError, SyntaxError):
-            return ''
+        crew_data = TMDBDataProcessor._parse_json_list(crew_json)
+        for person in crew_data:
+            if isinstance(person, dict) and person.get('job') == 'Director':
+                return TMDBDataProcessor._name_value(person)
+        return ''
     
     @staticmethod
     def get_main_actors_from_cast(cast_json: str, max_actors: int = 5) -> str:
@@ -72,118 +114,268 @@ class TMDBDataProcessor:
         Returns:
             str: Virgülle ayrılmış oyuncu adları
         """
-        if pd.isna(cast_json) or cast_json == '[]':
-            return ''
+        cast_data = TMDBDataProcessor._parse_json_list(cast_json)
         
-        try:
-            cast_data = ast.literal_eval(cast_json)
-            if isinstance(cast_data, list):
-                # İlk N oyuncuyu al (genelde en önemli oyuncular ilk sıralarda)
-                actors = []
-                for person in cast_data[:max_actors]:
-                    if isinstance(person, dict):
-                        actors.append(person.get('name', ''))
-                return ', '.join(actors)
-            return ''
-        except (ValueError, SyntaxError):
-            return ''
+        # İlk N oyuncuyu al (genelde en önemli oyuncular ilk sıralarda)
+        actors = []
+        for person in cast_data[:max_actors]:
+            if isinstance(person, dict):
+                actors.append(TMDBDataProcessor._name_value(person))
+        return ', '.join(actors)
+    
+    @staticmethod
+    def _column(df: pd.DataFrame, column: str, default: Any = '') -> pd.Series:
+        """
+        DataFrame'in sütununu döndürür; sütun yoksa varsayılan değerle dolu bir sütun oluşturur
+        
+        Args:
+            df (pd.DataFrame): Kaynak DataFrame
+            column (str): Sütun adı
+            default (Any): Sütun yoksa kullanılacak değer
+            
+        Returns:
+            pd.Series: Sütun
+        """
+        if column in df.columns:
+            return df[column]
+        return pd.Series([default] * len(df), index=df.index, dtype=object)
+    
+    @staticmethod
+    def _map_columns(jobs: list, executor: Optional[ProcessPoolExecutor] = None, workers: int = 1) -> list:
+        """
+        Sütunlara çözücü fonksiyonları uygular; süreç havuzu verilirse sütunları bölümlere ayırıp paralel çözer
+        
+        Tüm bölümler önce havuza gönderilir, sonuçlar gönderim sırasıyla toplanarak her sütun
+        orijinal satır sırasıyla yeniden birleştirilir.
+        
+        Args:
+            jobs (list): (pd.Series, fonksiyon) çiftleri
+            executor (Optional[ProcessPoolExecutor]): Süreç havuzu (None ise sıralı çözülür)
+            workers (int): Her sütunun ayrılacağı bölüm sayısı
+            
+        Returns:
+            list: Her iş için çözülmüş pd.Series (girdiyle aynı indeks)
+        """
+        if executor is None or workers <= 1:
+            return [values.map(func) for values, func in jobs]
+        
+        pending = []
+        for values, func in jobs:
+            bounds = [len(values) * part // workers for part in range(workers + 1)]
+            pending.append([
+                executor.submit(_map_partition, func, values.iloc[start:end].tolist())
+                for start, end in zip(bounds[:-1], bounds[1:]) if end > start
+            ])
+        
+        return [
+            pd.Series([value for future in futures for value in future.result()], index=values.index)
+            for (values, _), futures in zip(jobs, pending)
+        ]
     
     @staticmethod
-    def process_tmdb_dataset(movies_path: str, credits_path: str = None) -> pd.DataFrame:
+    def _reduce_credits(credits_df: pd.DataFrame, executor: Optional[ProcessPoolExecutor] = None,
+                        workers: int = 1) -> pd.DataFrame:
+        """
+        Credits satırlarını yalnızca yönetmen ve ana oyunculardan oluşan küçük bir tabloya indirger
+        
+        Büyük cast/crew JSON string'leri burada çözülür; dönen tablo onları tutmaz.
+        
+        Args:
+            credits_df (pd.DataFrame): TMDB credits satırları
+            executor (Optional[ProcessPoolExecutor]): JSON sütunlarını paralel çözmek için süreç havuzu
+            workers (int): Süreç havuzundaki işçi sayısı
+            
+        Returns:
+            pd.DataFrame: movie_id, director ve actors sütunları
+        """
+        director, actors = TMDBDataProcessor._map_columns([
+            (TMDBDataProcessor._column(credits_df, 'crew', '[]'), TMDBDataProcessor.get_director_from_crew),
+            (TMDBDataProcessor._column(credits_df, 'cast', '[]'), TMDBDataProcessor.get_main_actors_from_cast)
+        ], executor, workers)
+        
+        return pd.DataFrame({'movie_id': credits_df['movie_id'], 'director': director, 'actors': actors})
+    
+    @staticmethod
+    def process_tmdb_dataset(movies_path: str, credits_path: str = None, workers: int = 1) -> pd.DataFrame:
         """
         TMDB dataset'ini işleyerek content_based_recommender için uygun format oluşturur
         
         Args:
             movies_path (str): TMDB movies CSV dosyası yolu
             credits_path (str): TMDB credits CSV dosyası yolu (opsiyonel)
+            workers (int): JSON sütunlarını paralel çözecek süreç sayısı (1 ise tek süreçte çözülür)
             
         Returns:
             pd.DataFrame: İşlenmiş dataset
         """
+        if workers < 1:
+            raise ValueError("İşçi sayısı en az 1 olmalıdır")
+        
         # Movies dosyasını yükle
         print("📁 TMDB movies dataset'i yükleniyor...")
         movies_df = pd.read_csv(movies_path)
         
-        # Credits dosyası varsa yükle
-        crew_data = {}
-        cast_data = {}
+        executor = None
+        if workers > 1:
+            print(f"⚡ JSON sütunları {workers} süreçte paralel çözülüyor...")
+            executor = ProcessPoolExecutor(max_workers=workers)
+        
+        try:
+            # Credits dosyası varsa yükle ve hemen yönetmen/oyuncu tablosuna indirge
+            credits_table = pd.DataFrame({'movie_id': pd.Series(dtype=movies_df['id'].dtype),
+                                          'director': pd.Series(dtype=object),
+                                          'actors': pd.Series(dtype=object)})
+            
+            if credits_path:
+                try:
+                    print("📁 TMDB credits dataset'i yükleniyor...")
+                    credit_chunks = [
+                        TMDBDataProcessor._reduce_credits(chunk, executor, workers)
+                        for chunk in pd.read_csv(credits_path, chunksize=TMDBDataProcessor.CREDITS_CHUNKSIZE)
+                    ]
+                    
+                    if credit_chunks:
+                        # Aynı film birden fazla kez geçerse son kayıt kullanılır
+                        credits_table = pd.concat(credit_chunks, ignore_index=True).drop_duplicates('movie_id', keep='last')
+                    
+                except FileNotFoundError:
+                    print("⚠️  Credits dosyası bulunamadı, sadece movies verileri kullanılacak")
+            
+            print("🔄 Dataset işleniyor...")
+            
+            # Director ve actors - credits tablosuyla id üzerinden birleştirilir; credits'te olmayan
+            # filmler boş kalır (genre ve plot summary daha önemli)
+            credits_columns = movies_df[['id']].merge(
+                credits_table, how='left', left_on='id', right_on='movie_id'
+            ).set_index(movies_df.index)
+            
+            df = TMDBDataProcessor._build_movies_frame(
+                movies_df, credits_columns['director'], credits_columns['actors'], executor, workers
+            )
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        
+        # Başarı mesajı
+        print(f"✅ {len(df)} film başarıyla işlendi!")
+        print(f"📊 Benzersiz tür sayısı: {len(set([g for genres in df['genres'] for g in genres.split(', ') if g]))}")
+        print(f"📊 Benzersiz yönetmen sayısı: {df['director'].nunique()}")
+        
+        return df
+    
+    @staticmethod
+    def _build_movies_frame(movies_df: pd.DataFrame, director: pd.Series, actors: pd.Series,
+                            executor: Optional[ProcessPoolExecutor] = None, workers: int = 1) -> pd.DataFrame:
+        """
+        Ham movies satırlarından işlenmiş dataset formatını oluşturur
+        
+        Args:
+            movies_df (pd.DataFrame): TMDB movies satırları
+            director (pd.Series): Her film için yönetmen (movies_df ile aynı indeks)
+            actors (pd.Series): Her film için ana oyuncular (movies_df ile aynı indeks)
+            executor (Optional[ProcessPoolExecutor]): JSON sütunlarını paralel çözmek için süreç havuzu
+            workers (int): Süreç havuzundaki işçi sayısı
+            
+        Returns:
+            pd.DataFrame: İşlenmiş satırlar (boş değerler temizlenmiş)
+        """
+        # Her JSON sütunu satır satır iterrows yerine sütun bazında çözülür
+        movie_ids = movies_df['id']
+        genres, keywords, companies = TMDBDataProcessor._map_columns([
+            (TMDBDataProcessor._column(movies_df, column, '[]'), TMDBDataProcessor.extract_names_from_json)
+            for column in ('genres', 'keywords', 'production_companies')
+        ], executor, workers)
+        
+        # DataFrame oluştur
+        df = pd.DataFrame({
+            'movie_id': movie_ids.astype(int),
+            'title': TMDBDataProcessor._column(movies_df, 'title'),
+            'genres': genres,
+            'director': director,
+            'actors': actors,
+            'plot_summary': TMDBDataProcessor._column(movies_df, 'overview').fillna(''),  # Overview kullan
+            'keywords': keywords,
+            'companies': companies,
+            'release_date': TMDBDataProcessor._column(movies_df, 'release_date'),
+            'vote_average': TMDBDataProcessor._column(movies_df, 'vote_average', 0),
+            'vote_count': TMDBDataProcessor._column(movies_df, 'vote_count', 0),
+            'popularity': TMDBDataProcessor._column(movies_df, 'popularity', 0)
+        })
+        
+        # Boş değerleri temizle
+        return df.fillna('')
+    
+    @staticmethod
+    def process_tmdb_dataset_streaming(movies_path: str, output_path: str, credits_path: str = None,
+                                       chunksize: int = 10000) -> int:
+        """
+        TMDB dataset'ini parça parça işleyerek doğrudan CSV'ye yazar (çok büyük dökümler için)
+        
+        Bellek kullanımı dataset boyutuyla değil parça boyutuyla sınırlıdır: credits dosyası
+        parçalar halinde okunup yalnızca yönetmen ve ana oyunculardan oluşan küçük bir tabloya
+        indirgenir (büyük cast/crew JSON'ları bellekte tutulmaz), movies dosyası da parça parça
+        işlenip çıktı dosyasına eklenir. Çıktı save_processed_dataset ile aynı formattadır.
+        
+        Args:
+            movies_path (str): TMDB movies CSV dosyası yolu
+            output_path (str): Çıktı dosyası yolu
+            credits_path (str): TMDB credits CSV dosyası yolu (opsiyonel)
+            chunksize (int): Bir seferde okunacak satır sayısı
+            
+        Returns:
+            int: Yazılan film sayısı
+        """
+        if chunksize <= 0:
+            raise ValueError("Parça boyutu pozitif olmalıdır")
+        
+        # Credits dosyası varsa yönetmen/oyuncu tablosuna indirge
+        credits_table = pd.DataFrame({'director': pd.Series(dtype=object), 'actors': pd.Series(dtype=object)})
         
         if credits_path:
             try:
-                print("📁 TMDB credits dataset'i yükleniyor...")
-                credits_df = pd.read_csv(credits_path)
+                print("📁 TMDB credits dataset'i parça parça okunuyor...")
+                credit_chunks = []
+                for chunk in pd.read_csv(credits_path, chunksize=chunksize):
+                    credit_chunks.append(TMDBDataProcessor._reduce_credits(chunk).set_index('movie_id'))
                 
-                # Crew ve cast verilerini dictionary'e dönüştür
-                for _, row in credits_df.iterrows():
-                    movie_id = row['movie_id']
-                    crew_data[movie_id] = row.get('crew', '[]')
-                    cast_data[movie_id] = row.get('cast', '[]')
+                if credit_chunks:
+                    credits_table = pd.concat(credit_chunks)
+                    # Aynı film birden fazla kez geçerse son kayıt kullanılır
+                    credits_table = credits_table[~credits_table.index.duplicated(keep='last')]
                     
             except FileNotFoundError:
                 print("⚠️  Credits dosyası bulunamadı, sadece movies verileri kullanılacak")
         
-        print("🔄 Dataset işleniyor...")
-        
-        # Yeni DataFrame oluştur
-        processed_data = []
-        
-        for _, row in movies_df.iterrows():
-            movie_id = row['id']
-            
-            # Temel bilgiler
-            title = row.get('title', '')
-            overview = row.get('overview', '')
-            
-            # Genres JSON'unu işle
-            genres = TMDBDataProcessor.extract_names_from_json(row.get('genres', '[]'))
-            
-            # Keywords JSON'unu işle
-            keywords = TMDBDataProcessor.extract_names_from_json(row.get('keywords', '[]'))
-            
-            # Production companies
-            companies = TMDBDataProcessor.extract_names_from_json(row.get('production_companies', '[]'))
-              # Director ve actors - credits dosyasından veya movies'den
-            if credits_path and movie_id in crew_data:
-                director = TMDBDataProcessor.get_director_from_crew(crew_data[movie_id])
-                actors = TMDBDataProcessor.get_main_actors_from_cast(cast_data[movie_id])
-            else:
-                # Credits yoksa boş bırak, genre ve plot summary daha önemli
-                director = ''
-                actors = ''
-            
-            # Plot summary - overview kullan
-            plot_summary = overview if pd.notna(overview) else ''
-            
-            # Kayıt oluştur
-            record = {
-                'movie_id': int(movie_id),
-                'title': title,
-                'genres': genres,
-                'director': director,
-                'actors': actors,
-                'plot_summary': plot_summary,
-                'keywords': keywords,
-                'companies': companies,
-                'release_date': row.get('release_date', ''),
-                'vote_average': row.get('vote_average', 0),
-                'vote_count': row.get('vote_count', 0),
-                'popularity': row.get('popularity', 0)
-            }
-            
-            processed_data.append(record)
+        print("🔄 Dataset parça parça işleniyor...")
         
-        # DataFrame oluştur
-        df = pd.DataFrame(processed_data)
+        written = 0
+        genre_names = set()
+        director_names = set()
         
-        # Boş değerleri temizle
-        df = df.fillna('')
+        for chunk in pd.read_csv(movies_path, chunksize=chunksize):
+            df = TMDBDataProcessor._build_movies_frame(
+                chunk, chunk['id'].map(credits_table['director']), chunk['id'].map(credits_table['actors'])
+            )
+            
+            # İlk parça dosyayı başlıkla oluşturur, sonrakiler eklenir
+            df[TMDBDataProcessor.OUTPUT_COLUMNS].to_csv(
+                output_path, mode='w' if written == 0 else 'a', header=written == 0, index=False, encoding='utf-8'
+            )
+            
+            written += len(df)
+            genre_names.update(g for genres in df['genres'] for g in genres.split(', ') if g)
+            director_names.update(df['director'])
+        
+        if written == 0:
+            pd.DataFrame(columns=TMDBDataProcessor.OUTPUT_COLUMNS).to_csv(output_path, index=False, encoding='utf-8')
         
         # Başarı mesajı
-        print(f"✅ {len(df)} film başarıyla işlendi!")
-        print(f"📊 Benzersiz tür sayısı: {len(set([g for genres in df['genres'] for g in genres.split(', ') if g]))}")
-        print(f"📊 Benzersiz yönetmen sayısı: {df['director'].nunique()}")
+        print(f"✅ {written} film başarıyla işlendi!")
+        print(f"📊 Benzersiz tür sayısı: {len(genre_names)}")
+        print(f"📊 Benzersiz yönetmen sayısı: {len(director_names)}")
+        print(f"💾 İşlenmiş dataset kaydedildi: {output_path}")
         
-        return df
+        return written
     
     @staticmethod
     def save_processed_dataset(df: pd.DataFrame, output_path: str):
@@ -195,8 +387,7 @@ class TMDBDataProcessor:
             output_path (str): Çıktı dosyası yolu
         """
         # Sadece gerekli sütunları kaydet
-        columns_to_save = ['movie_id', 'title', 'genres', 'director', 'actors', 'plot_summary']
-        df_to_save = df[columns_to_save].copy()
+        df_to_save = df[TMDBDataProcessor.OUTPUT_COLUMNS].copy()
         
         df_to_save.to_csv(output_path, index=False, encoding='utf-8')
         print(f"💾 İşlenmiş dataset kaydedildi: {output_path}")
@@ -0,0 +1,645 @@
+"""
+OMDBEnhancedRecommender Performans Ölçümleri
+
+Bu script, öneri motorunun sıcak yollarını büyük sentetik kataloglar üzerinde ölçer.
+Sentetik katalog, örnek OMDB verisetindeki satırlardan türetilir; özet metinleri
+tüm verisetindeki kelimelerden rastgele seçildiği için sözlük gerçekçi biçimde büyür.
+
+Kullanım:
+    python benchmark_omdb_recommender.py               # 50.000 filmlik sentetik katalog
+    python benchmark_omdb_recommender.py katalog.csv   # kendi kataloğunuz üzerinde
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from omdb_enhanced_recommender import OMDBEnhancedRecommender
+
+
+SOURCE_DATASET = 'omdb_enriched_sample_movies.csv'
+
+
+def create_synthetic_catalog(source_csv: str, num_movies: int, output_path: str, seed: int = 42) -> str:
+    """
+    Örnek verisetinden büyük bir sentetik katalog üretir.
+
+    Args:
+        source_csv (str): Kaynak OMDB verisetinin yolu
+        num_movies (int): Üretilecek film sayısı
+        output_path (str): Sentetik CSV'nin yazılacağı yol
+        seed (int): Rastgelelik tohumu
+
+    Returns:
+        str: Yazılan CSV dosyasının yolu
+    """
+    rng = np.random.default_rng(seed)
+    source_df = pd.read_csv(source_csv)
+
+    # Tüm özetlerdeki kelimeleri tek bir havuzda topla
+    word_pool = np.array(' '.join(source_df['omdb_plot'].fillna('').astype(str)).split())
+
+    rows = source_df.iloc[rng.integers(0, len(source_df), size=num_movies)].reset_index(drop=True)
+    rows['movie_id'] = np.arange(1, num_movies + 1)
+    rows['title'] = rows['title'].astype(str) + ' #' + rows['movie_id'].astype(str)
+    rows['omdb_plot'] = [
+        ' '.join(rng.choice(word_pool, size=rng.integers(30, 80)))
+        for _ in range(num_movies)
+    ]
+
+    rows.to_csv(output_path, index=False)
+    return output_path
+
+
+def _dense_profile_legacy(recommender: OMDBEnhancedRecommender, watched_indices: list) -> np.ndarray:
+    """Eski yoğun profil hesabı (karşılaştırma için): toarray + np.average"""
+    watched_vectors = recommender.tfidf_matrix[watched_indices]
+    weights = recommender._get_movie_weights(watched_indices)
+    weights = weights / weights.sum()
+    return np.average(watched_vectors.toarray(), axis=0, weights=weights)
+
+
+def _build_feature_texts_legacy(recommender: OMDBEnhancedRecommender, df: pd.DataFrame) -> list:
+    """Eski satır satır özellik metni üretimi (karşılaştırma için): iterrows + if zincirleri"""
+    text_features = []
+
+    for _, row in df.iterrows():
+        features_text = []
+
+        genres = str(row['genres']).replace(',', ' ')
+        features_text.append(genres + ' ' + genres)
+
+        director = str(row['director'])
+        features_text.append(director + ' ' + director)
+
+        features_text.append(str(row['actors']))
+        features_text.append(str(row['plot_summary']))
+
+        if 'language' in row and pd.notna(row['language']):
+            features_text.append(str(row['language']))
+
+        if 'country' in row and pd.notna(row['country']):
+            features_text.append(str(row['country']))
+
+        if 'awards' in row and pd.notna(row['awards']):
+            awards = str(row['awards'])
+            if 'Oscar' in awards or 'Emmy' in awards or 'Golden Globe' in awards:
+                features_text.append(awards + ' ' + awards)
+            else:
+                features_text.append(awards)
+
+        if hasattr(recommender, 'imdb_rating_numeric') and 'imdb_rating_numeric' in row:
+            rating = row['imdb_rating_numeric']
+            if rating >= 8.0:
+                features_text.append('excellent_rating')
+            elif rating >= 7.0:
+                features_text.append('good_rating')
+            elif rating >= 6.0:
+                features_text.append('average_rating')
+
+        if hasattr(recommender, 'runtime_numeric') and 'runtime_numeric' in row:
+            runtime = row['runtime_numeric']
+            if runtime >= 150:
+                features_text.append('long_movie')
+            elif runtime >= 90:
+                features_text.append('standard_movie')
+            elif runtime > 0:
+                features_text.append('short_movie')
+
+        if hasattr(recommender, 'year_numeric') and 'year_numeric' in row:
+            year = row['year_numeric']
+            if year >= 2020:
+                features_text.append('decade_2020s')
+            elif year >= 2010:
+                features_text.append('decade_2010s')
+            elif year >= 2000:
+                features_text.append('decade_2000s')
+            elif year >= 1990:
+                features_text.append('decade_1990s')
+            elif year >= 1980:
+                features_text.append('decade_1980s')
+            elif year > 0:
+                features_text.append('classic_era')
+
+        text_features.append(' '.join(features_text))
+
+    return text_features
+
+
+def _measure(func, repeats: int = 5):
+    """Fonksiyonun ortalama süresini (ms) ve tepe bellek kullanımını (KB) ölçer"""
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    elapsed_ms = (time.perf_counter() - start) / repeats * 1000
+
+    return elapsed_ms, peak / 1024
+
+
+def benchmark_feature_construction(recommender: OMDBEnhancedRecommender, catalog_path: str):
+    """Sütun bazlı özellik metni üretimini eski iterrows sürümüyle karşılaştırır (eşitlik + süre)"""
+    print("\n🧱 Özellik metinleri: iterrows (eski) vs sütun bazlı (yeni)")
+    print("─" * 70)
+
+    df = recommender._prepare_dataframe(pd.read_csv(catalog_path))
+
+    start = time.perf_counter()
+    legacy_features = _build_feature_texts_legacy(recommender, df)
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    features = recommender._build_feature_texts(df)
+    vectorized_s = time.perf_counter() - start
+
+    mismatches = sum(1 for old, new in zip(legacy_features, features) if old != new)
+    print(f"{len(df)} film | eski: {legacy_s:.2f} sn | yeni: {vectorized_s:.2f} sn | "
+          f"hızlanma: {legacy_s / max(vectorized_s, 1e-9):.1f}x | farklı metin: {mismatches}")
+
+    # Kategori (rating/süre/dekad) kuralları da karşılaştırılsın diye kapıları geçici olarak aç
+    bucket_columns = ['imdb_rating_numeric', 'runtime_numeric', 'year_numeric']
+    for column in bucket_columns:
+        setattr(recommender, column, True)
+    try:
+        sample = df.head(5000)
+        mismatches = sum(
+            1 for old, new in zip(_build_feature_texts_legacy(recommender, sample), recommender._build_feature_texts(sample))
+            if old != new
+        )
+        print(f"Kategori kuralları açıkken ({len(sample)} film) farklı metin: {mismatches}")
+    finally:
+        for column in bucket_columns:
+            delattr(recommender, column)
+
+    if mismatches or len(legacy_features) != len(features):
+        raise AssertionError("Sütun bazlı özellik metinleri eski sürümle aynı değil")
+
+
+def benchmark_matrix_dtype(catalog_path: str, num_queries: int = 100, k: int = 10, seed: int = 0,
+                           min_overlap: float = 0.99, max_score_diff: float = 1e-5):
+    """float32 matris modunun bellek kazancını ve sıralamaların float64 ile uyumunu ölçer"""
+    print("\n🧮 TF-IDF matrisi: float64 vs float32")
+    print("─" * 70)
+
+    baseline = OMDBEnhancedRecommender(catalog_path)
+    compact = OMDBEnhancedRecommender(catalog_path, matrix_dtype='float32')
+
+    for name, recommender in (('float64', baseline), ('float32', compact)):
+        report = recommender.get_memory_report()
+        print(f"{name:>8} | matris: {report['matrix_bytes'] / 1024 ** 2:>8.1f} MB | "
+              f"float64/int64'e göre tasarruf: {report['saved_bytes'] / 1024 ** 2:>8.1f} MB")
+
+    rng = np.random.default_rng(seed)
+    num_movies = baseline.tfidf_matrix.shape[0]
+    overlaps, score_diffs = [], []
+
+    for _ in range(num_queries):
+        watched_indices = rng.choice(num_movies, size=int(rng.integers(1, 21)), replace=False).tolist()
+
+        baseline_scores = baseline._score_profile(baseline._get_user_profile(watched_indices))
+        compact_scores = compact._score_profile(compact._get_user_profile(watched_indices))
+
+        baseline_top = baseline._select_top_k(baseline_scores, k, watched_indices)
+        compact_top = compact._select_top_k(compact_scores, k, watched_indices)
+
+        overlaps.append(len(set(baseline_top.tolist()) & set(compact_top.tolist())) / max(len(baseline_top), 1))
+        score_diffs.append(float(np.max(np.abs(baseline_scores - compact_scores))))
+
+    print(f"Top-{k} örtüşme (ortalama / en düşük): {np.mean(overlaps):.4f} / {np.min(overlaps):.2f} | "
+          f"maks. skor farkı: {max(score_diffs):.1e}")
+
+    if np.mean(overlaps) < min_overlap or max(score_diffs) > max_score_diff:
+        raise AssertionError("float32 sıralamaları float64 sonuçlarından tolerans dışında sapıyor")
+
+
+def benchmark_model_loading(catalog_path: str, cache_dir: str):
+    """Eğitim, önbellekten normal yükleme ve bellek eşlemeli yükleme sürelerini karşılaştırır"""
+    print("\n📂 Model yükleme: eğitim vs önbellek vs bellek eşleme")
+    print("─" * 70)
+
+    timings = []
+    for name, kwargs in (('Eğitim + kayıt', {}), ('Önbellekten yükleme', {}), ('Bellek eşlemeli', {'mmap': True})):
+        start = time.perf_counter()
+        recommender = OMDBEnhancedRecommender(catalog_path, model_cache_dir=cache_dir, **kwargs)
+        timings.append((name, time.perf_counter() - start))
+
+    for name, elapsed in timings:
+        print(f"{name:>20} | {elapsed:>7.2f} sn")
+
+    # Bellek eşlemeli yüklemede sayısal sütunlar da diskteki dosyaya bağlı kalmalı (özel belleğe kopyalanmamalı)
+    numeric_columns = [column for column in recommender.df.columns if recommender.df[column].dtype.kind in 'biuf']
+    copied = [column for column in numeric_columns if not _is_memmap_backed(recommender.df[column].to_numpy())]
+    print(f"Bellek eşlemeli sayısal sütunlar: {len(numeric_columns) - len(copied)}/{len(numeric_columns)} "
+          f"(pandas {pd.__version__})")
+
+    if copied or not _is_memmap_backed(recommender.tfidf_matrix.data):
+        raise AssertionError(f"Bellek eşlemeli yüklemede kopyalanan diziler var: {copied or ['tfidf_matrix']}")
+
+
+def check_incremental_save_load(catalog_path: str, tmp_dir: str, num_added: int = 20, seed: int = 0):
+    """add_movies/remove_movies sonrası save_model ile yazılan artefaktın load_model ile aynen geri yüklendiğini doğrular"""
+    print("\n🔁 Artımlı güncelleme sonrası kayıt → yükleme")
+    print("─" * 70)
+
+    catalog_df = pd.read_csv(catalog_path)
+    base_path = os.path.join(tmp_dir, 'round_trip_base.csv')
+    catalog_df.iloc[:-num_added].to_csv(base_path, index=False)
+    model_dir = os.path.join(tmp_dir, 'round_trip_model')
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        updated = OMDBEnhancedRecommender(base_path)
+        updated.add_movies(catalog_df.iloc[-num_added:])
+        updated.remove_movies(catalog_df['movie_id'].iloc[:3].tolist())
+        updated.save_model(model_dir)
+
+        restored = OMDBEnhancedRecommender(base_path)
+        restored.load_model(model_dir)
+
+    rng = np.random.default_rng(seed)
+    movie_ids = updated.df['movie_id'].tolist()
+    queries = [rng.choice(movie_ids, size=5, replace=False).tolist() for _ in range(20)]
+    queries.append(movie_ids[-5:])
+
+    same_catalog = updated.df.equals(restored.df) and (updated.tfidf_matrix != restored.tfidf_matrix).nnz == 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        same_recommendations = all(
+            [rec['movie_id'] for rec in updated.get_recommendations(query, 10)] ==
+            [rec['movie_id'] for rec in restored.get_recommendations(query, 10)]
+            for query in queries
+        )
+    print(f"Film: {len(restored.df)} | aynı katalog ve matris: {same_catalog} | "
+          f"aynı öneriler ({len(queries)} sorgu): {same_recommendations}")
+
+    if not (same_catalog and same_recommendations):
+        raise AssertionError("Artımlı güncelleme sonrası kaydedilen model aynen geri yüklenemedi")
+
+    # Katalog hash'i tutmayan artefakt reddedilmeli
+    meta_path = os.path.join(model_dir, 'meta.json')
+    with open(meta_path, 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    meta['catalog_hash'] = '0' * 64
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            restored.load_model(model_dir)
+    except ValueError:
+        print("Katalog hash'i bozulmuş artefakt reddedildi: True")
+    else:
+        raise AssertionError("Katalog hash'i eşleşmeyen artefakt yüklendi")
+
+
+def _is_memmap_backed(values: np.ndarray) -> bool:
+    """Dizinin (veya türetildiği dizilerden birinin) diskten eşlenmiş bir np.memmap olup olmadığını döndürür"""
+    while isinstance(values, np.ndarray):
+        if isinstance(values, np.memmap):
+            return True
+        values = values.base
+    return False
+
+
+def benchmark_sharded_scoring(recommender: OMDBEnhancedRecommender, shard_counts: list,
+                              num_queries: int = 50, k: int = 10, seed: int = 0):
+    """Bölümlü (sharded) tam skorlamanın bölüm sayısına göre ölçeklenmesini ölçer"""
+    print(f"\n🧩 Bölümlü skorlama (CPU çekirdeği: {os.cpu_count()})")
+    print("─" * 70)
+
+    rng = np.random.default_rng(seed)
+    num_movies = recommender.tfidf_matrix.shape[0]
+    queries = []
+    for _ in range(num_queries):
+        watched_indices = rng.choice(num_movies, size=int(rng.integers(5, 21)), replace=False).tolist()
+        queries.append((watched_indices, recommender._get_user_profile(watched_indices)))
+
+    def single_path():
+        return [
+            recommender._select_top_k(recommender._score_profile(profile), k, watched_indices)
+            for watched_indices, profile in queries
+        ]
+
+    expected = single_path()
+    start = time.perf_counter()
+    single_path()
+    single_ms = (time.perf_counter() - start) / num_queries * 1000
+    print(f"{'Tek çekirdek':>22} | {single_ms:>7.2f} ms/sorgu")
+
+    for use_processes in (False, True):
+        mode = 'süreç' if use_processes else 'iş parçacığı'
+        for num_shards in shard_counts:
+            recommender.enable_sharding(num_shards, use_processes=use_processes)
+            try:
+                results = [
+                    recommender._score_sharded(profile, k, watched_indices)[0]
+                    for watched_indices, profile in queries
+                ]
+                start = time.perf_counter()
+                for watched_indices, profile in queries:
+                    recommender._score_sharded(profile, k, watched_indices)
+                sharded_ms = (time.perf_counter() - start) / num_queries * 1000
+            finally:
+                recommender.disable_sharding()
+
+            mismatches = sum(1 for exact, sharded in zip(expected, results) if not np.array_equal(exact, sharded))
+            print(f"{num_shards:>3} bölüm ({mode:>12}) | {sharded_ms:>7.2f} ms/sorgu | "
+                  f"hızlanma: {single_ms / sharded_ms:>5.2f}x | farklı sonuç: {mismatches}")
+
+
+def benchmark_user_profile(recommender: OMDBEnhancedRecommender, history_sizes: list, seed: int = 0):
+    """Yoğun ve seyrek kullanıcı profili hesabını farklı izleme geçmişi boyutlarında karşılaştırır"""
+    print("\n🧪 Kullanıcı Profili: yoğun (eski) vs seyrek (yeni)")
+    print("─" * 70)
+    print(f"{'İzlenen':>8} | {'Yoğun ms':>9} | {'Yoğun KB':>10} | {'Seyrek ms':>9} | {'Seyrek KB':>10} | {'Maks. fark':>10}")
+
+    rng = np.random.default_rng(seed)
+    num_movies = recommender.tfidf_matrix.shape[0]
+
+    for history_size in history_sizes:
+        watched_indices = rng.choice(num_movies, size=min(history_size, num_movies), replace=False).tolist()
+
+        def dense_path():
+            profile = _dense_profile_legacy(recommender, watched_indices)
+            norm = np.linalg.norm(profile)
+            return (recommender.tfidf_matrix @ profile) / norm
+
+        def sparse_path():
+            profile = recommender._get_user_profile(watched_indices)
+            return recommender._score_profile(profile)
+
+        dense_ms, dense_kb = _measure(dense_path)
+        sparse_ms, sparse_kb = _measure(sparse_path)
+        max_diff = float(np.max(np.abs(dense_path() - sparse_path())))
+
+        print(f"{len(watched_indices):>8} | {dense_ms:>9.2f} | {dense_kb:>10.0f} | {sparse_ms:>9.2f} | {sparse_kb:>10.0f} | {max_diff:>10.1e}")
+
+
+def benchmark_pagination(recommender: OMDBEnhancedRecommender, num_pages: int = 50, page_size: int = 4,
+                         pool_size: int = 100, seed: int = 0):
+    """Geniş listeyi her seferinde yeniden üretip filtrelemeyi öneri imleciyle sayfalamaya karşı ölçer"""
+    print(f"\n📄 Sayfalama: {pool_size} öneri üret + filtrele (eski) vs öneri imleci (yeni)")
+    print("─" * 70)
+
+    rng = np.random.default_rng(seed)
+    movie_ids = recommender.df['movie_id'].to_numpy()
+    watched_ids = rng.choice(movie_ids, size=5, replace=False).tolist()
+
+    def legacy_pages():
+        shown, pages = set(), []
+        for _ in range(num_pages):
+            recommender.invalidate_cache()
+            page = [rec for rec in recommender.get_recommendations(watched_ids, pool_size)
+                    if rec['movie_id'] not in shown][:page_size]
+            shown.update(rec['movie_id'] for rec in page)
+            pages.append(page)
+        return pages
+
+    def cursor_pages():
+        cursor = recommender.create_recommendation_cursor(watched_ids)
+        return [cursor.next_page(page_size) for _ in range(num_pages)]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        legacy_ms, _ = _measure(legacy_pages, repeats=1)
+        cursor_ms, _ = _measure(cursor_pages, repeats=1)
+        legacy, paged = legacy_pages(), cursor_pages()
+
+    legacy_shown = sum(len(page) for page in legacy)
+    watched_indices, _ = recommender._lookup_movie_indices(watched_ids)
+    scores = recommender._score_profile(recommender._get_user_profile(watched_indices))
+    reference = recommender._select_top_k(scores, num_pages * page_size, watched_indices)
+    paged_ids = [rec['movie_id'] for page in paged for rec in page]
+    matches = paged_ids == movie_ids[reference].tolist()
+
+    print(f"{num_pages} sayfa x {page_size} | eski: {legacy_ms:.1f} ms ({legacy_shown} öneri gösterilebildi) | "
+          f"imleç: {cursor_ms:.1f} ms ({len(paged_ids)} öneri) | tam sıralamayla aynı: {matches}")
+
+
+def benchmark_filters(recommender: OMDBEnhancedRecommender, num_queries: int = 20, k: int = 10, seed: int = 0):
+    """Meta veri filtrelerini tam sıralama üzerinde sonradan filtrelemeye karşı ölçer ve sonuçları karşılaştırır"""
+    filters = {'min_year': 2000, 'max_runtime': 150, 'min_imdb_rating': 7, 'genres': ['Drama', 'Crime']}
+    print(f"\n🔎 Filtreler: tam sıralama + sonradan filtre (eski) vs skor maskesi (yeni) | {filters}")
+    print("─" * 70)
+
+    rng = np.random.default_rng(seed)
+    df = recommender.df
+    genre_sets = df['genres'].fillna('').str.lower().str.split(',').map(lambda values: {v.strip() for v in values})
+    legacy_mask = (
+        (df['year_numeric'].to_numpy() >= 2000)
+        & (df['runtime_numeric'].to_numpy() > 0) & (df['runtime_numeric'].to_numpy() <= 150)
+        & (df['imdb_rating_numeric'].to_numpy() >= np.float32(7))
+        & genre_sets.map(lambda values: bool(values & {'drama', 'crime'})).to_numpy()
+    )
+
+    recommender._filter_indexes = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        filter_key = recommender._normalize_filters(filters)
+        recommender._build_filter_mask(filter_key)
+        index_ms = (time.perf_counter() - start) * 1000
+        mask_ms, _ = _measure(lambda: recommender._build_filter_mask(filter_key))
+
+    queries = [rng.choice(len(df), size=3, replace=False).tolist() for _ in range(num_queries)]
+    legacy_s = masked_s = 0.0
+    matches = 0
+    for watched_indices in queries:
+        scores = recommender._score_profile(recommender._get_user_profile(watched_indices))
+
+        start = time.perf_counter()
+        ranked = recommender._select_top_k(scores, len(scores), watched_indices)
+        legacy = ranked[legacy_mask[ranked]][:k]
+        legacy_s += time.perf_counter() - start
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            masked = recommender._select_top_k(scores, k, watched_indices, recommender._build_filter_mask(filter_key))
+        masked_s += time.perf_counter() - start
+
+        matches += int(np.array_equal(legacy, masked))
+
+    print(f"Uygun film: {int(legacy_mask.sum())}/{len(df)} | indeks kurulumu: {index_ms:.1f} ms | "
+          f"maske: {mask_ms:.2f} ms")
+    print(f"Top-{k} seçimi: eski {legacy_s / num_queries * 1000:.2f} ms/sorgu | "
+          f"yeni {masked_s / num_queries * 1000:.2f} ms/sorgu | aynı sonuç: {matches}/{num_queries}")
+
+
+def benchmark_title_search(recommender: OMDBEnhancedRecommender, num_queries: int = 200, max_results: int = 10,
+                           seed: int = 0):
+    """Başlık aramasını regex taraması (eski) ile trigram indeksi (yeni) arasında karşılaştırır"""
+    print("\n🔤 Başlık araması: str.contains taraması (eski) vs trigram indeksi (yeni)")
+    print("─" * 70)
+
+    rng = np.random.default_rng(seed)
+    df = recommender.df
+    titles = df['title'].fillna('').astype(str).to_numpy()
+    ratings = df['imdb_rating_numeric'].to_numpy(dtype=np.float64)
+
+    # Sorgular: rastgele başlıklardan 2-8 karakterlik parçalar
+    queries = []
+    while len(queries) < num_queries:
+        title = titles[rng.integers(len(titles))]
+        start = int(rng.integers(max(len(title) - 1, 1)))
+        query = title[start:start + int(rng.integers(2, 9))]
+        if query.strip():
+            queries.append(query)
+
+    # Karşılaştırma, indeksle aynı harf/aksan katlamasıyla yapılır
+    normalize = recommender._normalize_search_text
+    searchable = [df[column].fillna('').astype(str).map(normalize)
+                  for column in recommender.SEARCH_COLUMNS if column in df.columns]
+
+    def legacy_search(query):
+        matches = np.zeros(len(df), dtype=bool)
+        for values in searchable:
+            matches |= values.str.contains(normalize(query), regex=False).to_numpy()
+        positions = np.flatnonzero(matches)
+        positions = positions[np.lexsort((positions, -ratings[positions]))]
+        return positions[:max_results]
+
+    start = time.perf_counter()
+    recommender._title_index = None
+    recommender._get_title_index()
+    index_s = time.perf_counter() - start
+
+    legacy_s = indexed_s = 0.0
+    matches = 0
+    for query in queries:
+        start = time.perf_counter()
+        expected = legacy_search(query)
+        legacy_s += time.perf_counter() - start
+
+        start = time.perf_counter()
+        found = recommender._find_title_positions(query, max_results)
+        indexed_s += time.perf_counter() - start
+
+        matches += int(np.array_equal(expected, found))
+
+    print(f"İndeks kurulumu: {index_s:.2f} sn | eski: {legacy_s / num_queries * 1000:.2f} ms/sorgu | "
+          f"yeni: {indexed_s / num_queries * 1000:.3f} ms/sorgu | aynı sonuç: {matches}/{num_queries}")
+
+    # Bulanık arama: başlıktaki 5+ harfli bir kelimeden bir harf silinmiş sorgular
+    start = time.perf_counter()
+    recommender._get_title_word_index()
+    word_index_s = time.perf_counter() - start
+
+    typo_queries = []
+    while len(typo_queries) < num_queries:
+        position = int(rng.integers(len(titles)))
+        words = [word for word in normalize(titles[position]).split() if len(word) >= 5 and word.isalpha()]
+        if words:
+            word = words[int(rng.integers(len(words)))]
+            cut = int(rng.integers(len(word)))
+            typo_queries.append((position, word[:cut] + word[cut + 1:]))
+
+    fuzzy_s = 0.0
+    found_count = 0
+    for position, typo in typo_queries:
+        start = time.perf_counter()
+        found = recommender._find_fuzzy_title_positions(typo)
+        fuzzy_s += time.perf_counter() - start
+
+        found_count += int(position in set(found.tolist()))
+
+    print(f"Bulanık arama | kelime indeksi: {word_index_s:.2f} sn | {fuzzy_s / num_queries * 1000:.3f} ms/sorgu | "
+          f"kaynak film bulunan: {found_count}/{num_queries}")
+
+
+def benchmark_ann_recall(recommender: OMDBEnhancedRecommender, probe_values: list,
+                         num_queries: int = 100, k: int = 10, seed: int = 0):
+    """ANN indeksinin recall@k ve gecikmesini farklı n_probe değerlerinde tam skorlama ile karşılaştırır"""
+    print(f"\n🧭 ANN indeksi: recall@{k} ve gecikme (tam skorlamaya göre)")
+    print("─" * 70)
+
+    rng = np.random.default_rng(seed)
+    num_movies = recommender.tfidf_matrix.shape[0]
+
+    # Komşu tablosu hızlı yolunun devreye girmemesi için 5-20 filmlik profiller
+    queries = []
+    for _ in range(num_queries):
+        watched_indices = rng.choice(num_movies, size=int(rng.integers(5, 21)), replace=False).tolist()
+        queries.append((watched_indices, recommender._get_user_profile(watched_indices)))
+
+    start = time.perf_counter()
+    exact_results = []
+    for watched_indices, profile in queries:
+        scores = recommender._score_profile(profile)
+        exact_results.append(set(recommender._select_top_k(scores, k, watched_indices).tolist()))
+    exact_ms = (time.perf_counter() - start) / num_queries * 1000
+
+    print(f"{'n_probe':>8} | {'Recall@' + str(k):>10} | {'Aday oranı':>10} | {'ms/sorgu':>9} | {'Tam ms/sorgu':>12}")
+
+    original_probe = recommender.ann_n_probe
+    for n_probe in probe_values:
+        recommender.ann_n_probe = n_probe
+        recalls, candidate_ratios = [], []
+
+        start = time.perf_counter()
+        for (watched_indices, profile), exact in zip(queries, exact_results):
+            candidates = recommender._get_ann_candidates(profile, watched_indices)
+            scores = recommender._score_profile(profile, candidates)
+            approximate = set(candidates[recommender._select_top_k(scores, k)].tolist())
+
+            recalls.append(len(approximate & exact) / max(len(exact), 1))
+            candidate_ratios.append(len(candidates) / num_movies)
+        ann_ms = (time.perf_counter() - start) / num_queries * 1000
+
+        print(f"{n_probe:>8} | {np.mean(recalls):>10.3f} | {np.mean(candidate_ratios):>10.3f} | {ann_ms:>9.2f} | {exact_ms:>12.2f}")
+
+    recommender.ann_n_probe = original_probe
+
+
+def main():
+    """Ana benchmark fonksiyonu"""
+    print("⏱️  OMDBEnhancedRecommender Performans Ölçümleri")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if len(sys.argv) > 1:
+            catalog_path = sys.argv[1]
+        else:
+            catalog_path = create_synthetic_catalog(
+                SOURCE_DATASET, 50000, os.path.join(tmp_dir, 'synthetic_catalog.csv')
+            )
+        recommender = OMDBEnhancedRecommender(catalog_path)
+
+        feature_catalog_path = catalog_path
+        if len(sys.argv) <= 1:
+            feature_catalog_path = create_synthetic_catalog(
+                SOURCE_DATASET, 100000, os.path.join(tmp_dir, 'synthetic_catalog_100k.csv')
+            )
+        benchmark_feature_construction(recommender, feature_catalog_path)
+
+        benchmark_matrix_dtype(catalog_path)
+
+        benchmark_model_loading(catalog_path, os.path.join(tmp_dir, 'model_cache'))
+
+        check_incremental_save_load(catalog_path, tmp_dir)
+
+        benchmark_user_profile(recommender, [10, 100, 500, 2000, 5000])
+
+        benchmark_sharded_scoring(recommender, [1, 2, 4, 8])
+
+        benchmark_pagination(recommender)
+
+        benchmark_filters(recommender)
+
+        benchmark_title_search(recommender)
+
+        recommender.build_ann_index()
+        benchmark_ann_recall(recommender, [1, 2, 4, 8, 16, 32, 64])
+
+    print("\n✅ Ölçümler tamamlandı!")
+
+
+if __name__ == "__main__":
+    main()
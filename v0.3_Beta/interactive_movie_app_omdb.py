@@ -9,6 +9,9 @@ import os
 from content_based_recommender import ContentBasedRecommender
 from omdb_enhanced_recommender import OMDBEnhancedRecommender
 
+# Eğitilmiş modellerin saklandığı dizin (katalog değişmedikçe yeniden eğitim yapılmaz)
+MODEL_CACHE_DIR = 'model_cache'
+
 
 class AdvancedInteractiveMovieRecommender:
     """OMDB destekli gelişmiş interaktif film önerme uygulaması"""
@@ -19,16 +22,27 @@ class AdvancedInteractiveMovieRecommender:
         self.user_movies = []  # Kullanıcının seçtiği filmler
         self.round_number = 0
         self.shown_recommendations = set()  # Gösterilen önerileri takip et
+        self.recommendation_cursor = None  # "Yeni öneriler" sayfalarının imleci (turda bir kez skorlanır)
         
         # Verisetinin OMDB zenginleştirilmiş olup olmadığını kontrol et
         self._initialize_recommender()
+        self.user_profile = self.recommender.create_user_profile()  # Her seçimde artımlı güncellenir
+        
+    def add_user_movie(self, movie_id: int):
+        """Seçilen filmi listeye ve zevk profiline ekle"""
+        self.user_movies.append(movie_id)
+        self.user_profile.add_movie(movie_id)
         
     def _initialize_recommender(self):
         """Verisetine göre uygun recommender'ı başlat"""
         try:
             # Önce OMDB zenginleştirilmiş verisetiyle dene
-            self.recommender = OMDBEnhancedRecommender(self.movie_data_path)
+            self.recommender = OMDBEnhancedRecommender(self.movie_data_path, model_cache_dir=MODEL_CACHE_DIR)
             self.is_omdb_enhanced = True
+            
+            # Birkaç filmle başlayan turlar için komşu tablosu (önbellekte yoksa bir kez hesaplanır)
+            if self.recommender.neighbor_indices is None:
+                self.recommender.build_neighbor_graph()
             print("✅ OMDB zenginleştirilmiş öneri sistemi yüklendi!")
         except:
             try:
@@ -55,8 +69,7 @@ class AdvancedInteractiveMovieRecommender:
         """Kullanıcının mevcut film listesini göster"""
         if self.user_movies:
             print(f"📚 Şu ana kadar seçtiğiniz filmler ({len(self.user_movies)} adet):")
-            for i, movie_id in enumerate(self.user_movies, 1):
-                movie_info = self.recommender.get_movie_info(movie_id)
+            for i, movie_info in enumerate(self.recommender.get_movies_info(self.user_movies), 1):
                 
                 # OMDB verisi varsa daha detaylı göster
                 if self.is_omdb_enhanced and 'imdb_rating' in movie_info:
@@ -82,8 +95,8 @@ class AdvancedInteractiveMovieRecommender:
                 print("❌ Lütfen bir film adı girin!")
                 continue
                 
-            # Arama yap
-            search_results = self.recommender.search_movies(search_query, max_results=10)
+            # Arama yap (yazım hatalarına ve Türkçe karakter farklarına toleranslı)
+            search_results = self.recommender.search_movies(search_query, max_results=10, fuzzy=True)
             
             if not search_results:
                 print(f"❌ '{search_query}' ile eşleşen film bulunamadı. Tekrar deneyin.")
@@ -153,21 +166,15 @@ class AdvancedInteractiveMovieRecommender:
         try:
             print("🔄 Sistem daha geniş arama yapıyor...")
             
-            # Daha fazla öneri al
-            all_recommendations = self.recommender.get_recommendations(
-                watched_movie_ids=self.user_movies,
-                num_recommendations=100  # Çok geniş pool
-            )
+            # Profil değişmediyse turun imlecinden sıradaki sayfayı al; gösterilenler hariç tutulur
+            if self.recommendation_cursor is None or self.recommendation_cursor.is_stale:
+                self.recommendation_cursor = self.recommender.create_recommendation_cursor(
+                    self.user_profile, exclude_movie_ids=self.shown_recommendations
+                )
+            else:
+                self.recommendation_cursor.exclude(self.shown_recommendations)
             
-            # Daha önce gösterilmemiş önerileri filtrele
-            new_recommendations = []
-            for rec in all_recommendations:
-                if rec['movie_id'] not in self.shown_recommendations:
-                    new_recommendations.append(rec)
-                    
-                    # 4 tane bulduğumuzda dur
-                    if len(new_recommendations) >= 4:
-                        break
+            new_recommendations = self.recommendation_cursor.next_page(4)
             
             if new_recommendations:
                 print(f"✅ {len(new_recommendations)} yeni öneri bulundu!")
@@ -186,6 +193,7 @@ class AdvancedInteractiveMovieRecommender:
     def reset_shown_recommendations(self):
         """Her yeni tur başında gösterilen önerileri sıfırla"""
         self.shown_recommendations.clear()
+        self.recommendation_cursor = None
             
     def select_from_recommendations(self, recommendations):
         """Önerilerden film seçme veya alternatif seçenekler"""
@@ -246,7 +254,7 @@ class AdvancedInteractiveMovieRecommender:
         # İlk 3 filmi seç
         for i in range(3):
             movie_id = self.search_and_select_movie(f"📝 {i+1}. filminizi seçin:")
-            self.user_movies.append(movie_id)
+            self.add_user_movie(movie_id)
             
             # Seçilen filmi göster
             movie_info = self.recommender.get_movie_info(movie_id)
@@ -274,7 +282,7 @@ class AdvancedInteractiveMovieRecommender:
         
         # Önerileri al
         recommendations = self.recommender.get_recommendations(
-            watched_movie_ids=self.user_movies,
+            watched_movie_ids=self.user_profile,
             num_recommendations=4
         )
         
@@ -293,7 +301,7 @@ class AdvancedInteractiveMovieRecommender:
             print("⏭️ Tur atlandı, devam ediliyor...")
             return True
             
-        self.user_movies.append(selected_movie_id)
+        self.add_user_movie(selected_movie_id)
         
         # Seçimi onayla
         movie_info = self.recommender.get_movie_info(selected_movie_id)